@@ -0,0 +1,358 @@
+"""
+Benchmarks of the scraper against the local stand-in site, so performance changes can be checked without LinkedIn.
+
+    python -m benchmarks.run --out results.json --baseline benchmarks/baseline.json
+
+The extraction and memory benchmarks parse the stand-in pages in-process. The CLI and ScrapingThread benchmarks drive
+a lean headless Chrome through the whole job, and are skipped when Chrome can not be started unless
+--require-browser is given. The startup benchmark times fresh interpreters up to the command line help, the main
+window and the first search results, the last one also needing Chrome. With a baseline, the run fails when a metric
+regresses more than the tolerance. Baselines are recorded from a run on the reference machine:
+
+    python -m benchmarks.run --require-browser --write-baseline benchmarks/baseline.json
+"""
+import gc
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+
+from time import perf_counter, sleep
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import click
+
+from selenium.common import WebDriverException
+
+from veget.linkedin import extractor, Profile, ProfileLink, ProfileLinkStore
+
+from .site import Site, serve
+from .startup import BROWSER_UNAVAILABLE
+
+# Whether a higher value of each metric is better, metrics not listed here are only reported
+HIGHER_IS_BETTER = {
+    "profiles_per_second": True,
+    "search_pages_per_second": True,
+    "driver_commands_per_profile": False,
+    "bytes_per_100k_profiles": False,
+    "list_bytes_per_100k_links": False,
+    "store_bytes_per_100k_links": False,
+    "time_to_first_row": False,
+    "time_to_cli_help": False,
+    "time_to_window": False,
+    "time_to_first_search": False,
+}
+
+# Directory the benchmarks package is in, where the startup steps run from
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FirstRowWatcher:
+    """Measures the time until the first row after the header shows up in an output file."""
+
+    def __init__(self, path: str, interval: float = 0.01):
+        self.path = path
+        self.interval = interval
+        self.started: float = perf_counter()
+        self.first_row: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="first-row-watcher", daemon=True)
+
+    def __enter__(self):
+        self.started = perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with open(self.path, "rb") as f:
+                    if f.read().count(b"\n") >= 2:
+                        self.first_row = perf_counter() - self.started
+                        return
+            except FileNotFoundError:
+                pass
+            sleep(self.interval)
+
+
+def bench_extraction(site: Site, full_experience: bool = False) -> Dict[str, Any]:
+    """Parse every search results page and profile of the site from their page source."""
+    search_pages: List[str] = [site.search_page(page) for page in range(1, site.pages + 1)]
+    profile_pages: List[str] = [site.profile_page(person.slug) for person in site.people]
+    details_pages: List[str] = [site.experience_details_page(person.slug) for person in site.people]
+
+    start: float = perf_counter()
+    profile_links: List[ProfileLink] = [link for page in search_pages for link in extractor.parse_search_results(page)]
+    search_time: float = perf_counter() - start
+
+    start = perf_counter()
+    profiles: List[Profile] = []
+    for page, details_page, link in zip(profile_pages, details_pages, profile_links):
+        profile_page: extractor.ProfilePage = extractor.parse_profile_page(page, link)
+        if full_experience and profile_page.more_experiences:
+            profiles.append(Profile(profile_page.profile.name,
+                                    extractor.parse_experience_details(details_page, profile_page.location)))
+        else:
+            profiles.append(profile_page.profile)
+    profile_time: float = perf_counter() - start
+    return {
+        "profiles": len(profiles),
+        "experiences": sum(len(profile.experiences) for profile in profiles),
+        "search_pages_per_second": len(search_pages) / search_time,
+        "profiles_per_second": len(profiles) / profile_time,
+    }
+
+
+def _traced_memory(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Build something while tracing allocations.
+    :return: What was built and the memory it holds, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before: int = tracemalloc.get_traced_memory()[0]
+    built = build()
+    gc.collect()
+    used: int = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return built, used
+
+
+def _search_links(search_pages: List[str], count: int) -> Iterator[ProfileLink]:
+    """
+    Profile links of the search pages, parsing every page again for each round, so nothing is shared between rounds,
+    as in a real job.
+    """
+    while True:
+        for search_page in search_pages:
+            for link in extractor.parse_search_results(search_page):
+                if count == 0:
+                    return
+                count -= 1
+                yield link
+
+
+def bench_memory(site: Site, profiles: int = 10_000) -> Dict[str, Any]:
+    """
+    Memory held by the profile links and profiles of a job, and by the profile links alone in a list and in a
+    ProfileLinkStore, scaled to 100k profiles.
+    """
+    search_pages: List[str] = [site.search_page(page) for page in range(1, site.pages + 1)]
+    profile_pages: List[str] = [site.profile_page(person.slug) for person in site.people]
+
+    kept, used = _traced_memory(lambda: [
+        (link, extractor.parse_profile(profile_pages[index % len(profile_pages)], link))
+        for index, link in enumerate(_search_links(search_pages, profiles))])
+    links, list_used = _traced_memory(lambda: list(_search_links(search_pages, profiles)))
+    store, store_used = _traced_memory(lambda: ProfileLinkStore(_search_links(search_pages, profiles)))
+    return {
+        "profiles": len(kept),
+        "bytes_per_100k_profiles": used * 100_000 / len(kept),
+        "list_bytes_per_100k_links": list_used * 100_000 / len(links),
+        "store_bytes_per_100k_links": store_used * 100_000 / len(store),
+    }
+
+
+def _job_results(summary: Dict[str, Any], output: str, elapsed: float, first_row: Optional[float]) -> Dict[str, Any]:
+    """Results of a whole scraping job, from the summary of its metrics and its output."""
+    visited: int = summary["counters"].get("profiles_visited", 0)
+    commands: Dict[str, Any] = summary["histograms"].get("driver_commands_per_profile", {})
+    with open(output, encoding="utf-8") as f:
+        rows: int = sum(1 for _ in f) - 1
+    return {
+        "profiles": visited,
+        "rows": rows,
+        "profiles_per_second": visited / elapsed if elapsed else 0.0,
+        "driver_commands_per_profile": commands.get("mean"),
+        "time_to_first_row": first_row,
+        "stages": {name: {"mean": stage["mean"], "p90": stage["p90"]} for name, stage in summary["histograms"].items()},
+    }
+
+
+def bench_cli(site: Site, workdir: str, sleep_time: int, timeout: int, full_experience: bool = False
+              ) -> Dict[str, Any]:
+    """Run the command line scraper over the site, writing a CSV."""
+    from veget.__main__ import main
+
+    output: str = os.path.join(workdir, "cli.csv")
+    metrics_out: str = os.path.join(workdir, "cli-metrics.json")
+    with FirstRowWatcher(output) as watcher:
+        main.main([
+            "--username", "benchmark", "--password", "benchmark", "--search-url", site.search_url,
+            "--sleep-time", str(sleep_time), "--timeout", str(timeout), "--lean", "--base-url", site.base_url,
+            "--output", output, "--company", site.company, "--metrics-out", metrics_out,
+            *(["--full-experience"] if full_experience else []),
+        ], standalone_mode=False)
+        elapsed: float = perf_counter() - watcher.started
+    with open(metrics_out, encoding="utf-8") as f:
+        return _job_results(json.load(f), output, elapsed, watcher.first_row)
+
+
+def bench_thread(site: Site, workdir: str, sleep_time: int, timeout: int, full_experience: bool = False
+                 ) -> Dict[str, Any]:
+    """Run the GUI scraping thread over the site, in the calling thread and without any window."""
+    from veget.progress import ScrapingProgress
+    from veget.ui.scraping_dialog import ScrapingThread
+
+    output: str = os.path.join(workdir, "thread.csv")
+    thread = ScrapingThread("benchmark", "benchmark", sleep_time, timeout, [(site.company, site.search_url)], output,
+                            ScrapingProgress(), use_cache=False, remember_login=False, lean=True,
+                            full_experience=full_experience, base_url=site.base_url)
+    with FirstRowWatcher(output) as watcher:
+        thread.run()
+        elapsed: float = perf_counter() - watcher.started
+    # The thread reports a failure instead of raising it, such as Chrome not starting
+    if thread.error is not None:
+        raise thread.error
+    return _job_results(thread.metrics.summary(), output, elapsed, watcher.first_row)
+
+
+def _time_process(args: List[str], ready: Optional[str] = None) -> float:
+    """
+    Time a new Python process from its launch until it prints the ready line, or until it exits without one.
+    :raise WebDriverException: If the process could not start Chrome.
+    """
+    env: Dict[str, str] = {**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")}
+    start: float = perf_counter()
+    process = subprocess.Popen([sys.executable, *args], cwd=ROOT, env=env, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE, text=True)
+    elapsed: Optional[float] = None
+    if ready is not None:
+        for line in process.stdout:
+            if line.strip() == ready:
+                elapsed = perf_counter() - start
+                break
+    _, stderr = process.communicate()
+    if ready is None:
+        elapsed = perf_counter() - start
+    if process.returncode == BROWSER_UNAVAILABLE:
+        raise WebDriverException(stderr.strip())
+    if process.returncode != 0 or elapsed is None:
+        raise RuntimeError(f"{' '.join(args)} failed: {stderr.strip()}")
+    return elapsed
+
+
+def bench_startup(site: Site, sleep_time: int, timeout: int, require_browser: bool = False, repeat: int = 3
+                  ) -> Dict[str, Any]:
+    """Median time of fresh interpreters to print the command line help, show the main window and search."""
+    results: Dict[str, Any] = {
+        "time_to_cli_help": statistics.median(_time_process(["-m", "veget", "--help"]) for _ in range(repeat)),
+        "time_to_window": statistics.median(
+            _time_process(["-m", "benchmarks.startup", "window"], ready="ready") for _ in range(repeat)),
+    }
+    # The window timings are kept when Chrome is missing
+    try:
+        results["time_to_first_search"] = statistics.median(_time_process(
+            ["-m", "benchmarks.startup", "search", site.base_url, site.search_url, str(sleep_time), str(timeout)],
+            ready="ready") for _ in range(repeat))
+    except WebDriverException as e:
+        if require_browser:
+            raise
+        results["time_to_first_search"] = None
+        results["skipped"] = f"Chrome could not be started: {e.msg}"
+    return results
+
+
+def baseline_of(results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """The metrics of results that are checked against a baseline, by benchmark."""
+    return {benchmark: {metric: value for metric, value in metrics.items()
+                        if metric in HIGHER_IS_BETTER and value is not None}
+            for benchmark, metrics in results.items()}
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    """
+    Compare results against a baseline.
+    :param tolerance: Relative change allowed in the wrong direction.
+    :return: Description of each regression.
+    """
+    regressions: List[str] = []
+    for benchmark, metrics in baseline.items():
+        for metric, expected in metrics.items():
+            actual = results.get(benchmark, {}).get(metric)
+            if metric not in HIGHER_IS_BETTER or actual is None or expected is None:
+                continue
+            if HIGHER_IS_BETTER[metric]:
+                regressed: bool = actual < expected * (1 - tolerance)
+            else:
+                regressed = actual > expected * (1 + tolerance)
+            if regressed:
+                regressions.append(f"{benchmark}.{metric}: {actual:.4g} against {expected:.4g} in the baseline")
+    return regressions
+
+
+@click.command()
+@click.option('--profiles', default=200, help='Profiles found by the stand-in search')
+@click.option('--max-positions', default=12, help='Most positions of a stand-in profile')
+@click.option('--memory-profiles', default=10_000, help='Profiles kept by the memory benchmark')
+@click.option('--sleep-time', default=5, help='Maximum time to wait for each page load')
+@click.option('--timeout', default=10, help='Timeout looking for web elements')
+@click.option('--only', multiple=True, type=click.Choice(["extraction", "memory", "startup", "cli", "thread"]),
+              help='Benchmarks to run, all of them by default')
+@click.option('--full-experience', is_flag=True,
+              help='Load the experience details page of the profiles with more experiences than their section shows')
+@click.option('--require-browser', is_flag=True, help='Fail instead of skipping the benchmarks that need Chrome')
+@click.option('--out', default=None, type=click.Path(dir_okay=False), help='JSON file to write the results to')
+@click.option('--baseline', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='JSON results to check for regressions against')
+@click.option('--tolerance', default=0.25, help='Relative regression allowed against the baseline')
+@click.option('--write-baseline', default=None, type=click.Path(dir_okay=False),
+              help='JSON baseline to record the results of the benchmarks run in, keeping the other benchmarks')
+def main(profiles, max_positions, memory_profiles, sleep_time, timeout, only, full_experience, require_browser, out,
+         baseline, tolerance, write_baseline):
+    logging.basicConfig(level=logging.WARNING)
+    site = Site(profiles=profiles, max_positions=max_positions)
+    benchmarks: Dict[str, Callable[[str], Dict[str, Any]]] = {
+        "extraction": lambda workdir: bench_extraction(site, full_experience),
+        "memory": lambda workdir: bench_memory(site, memory_profiles),
+        "startup": lambda workdir: bench_startup(site, sleep_time, timeout, require_browser),
+        "cli": lambda workdir: bench_cli(site, workdir, sleep_time, timeout, full_experience),
+        "thread": lambda workdir: bench_thread(site, workdir, sleep_time, timeout, full_experience),
+    }
+    results: Dict[str, Dict[str, Any]] = {}
+    with serve(site), tempfile.TemporaryDirectory() as workdir:
+        for name, benchmark in benchmarks.items():
+            if only and name not in only:
+                continue
+            click.echo(f"Running {name} benchmark...")
+            try:
+                results[name] = benchmark(workdir)
+            except WebDriverException as e:
+                if require_browser:
+                    raise
+                click.echo(f"Skipping {name} benchmark, Chrome could not be started: {e.msg}")
+                continue
+            click.echo(json.dumps(results[name], indent=2))
+
+    if out is not None:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if write_baseline is not None:
+        recorded: Dict[str, Dict[str, Any]] = {}
+        if os.path.exists(write_baseline):
+            with open(write_baseline, encoding="utf-8") as f:
+                recorded = json.load(f)
+        recorded.update(baseline_of(results))
+        with open(write_baseline, "w", encoding="utf-8") as f:
+            json.dump(recorded, f, indent=2)
+            f.write("\n")
+    if baseline is not None:
+        with open(baseline, encoding="utf-8") as f:
+            regressions: List[str] = compare(results, json.load(f), tolerance)
+        for regression in regressions:
+            click.echo(f"Regression: {regression}", err=True)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""
+Local stand-in for the LinkedIn pages the scraper visits: login form, people search results and profiles.
+
+The pages are synthetic, generated from a seed, and only reproduce the markup the selectors in
+`veget.linkedin.selectors` rely on, so the scraper runs against them exactly as against LinkedIn.
+"""
+import html
+import random
+import threading
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from veget.linkedin.selectors import RESULTS_PER_PAGE
+
+# Experiences listed by the experience section of a profile, the details page lists all of them
+SECTION_EXPERIENCES = 5
+
+FIRST_NAMES = ("Ana", "Luis", "Marta", "John", "Sofia", "Pedro", "Lucia", "Pablo", "Elena", "David", "Laura", "Hugo")
+LAST_NAMES = ("Garcia", "Smith", "Lopez", "Martin", "Sanchez", "Brown", "Perez", "Gomez", "Ruiz", "Diaz", "Moreno")
+POSITIONS = ("Software Engineer", "Senior Software Engineer", "Engineering Manager", "Product Manager", "Designer",
+             "Data Scientist", "Sales Executive", "Account Manager", "Recruiter", "QA Engineer", "DevOps Engineer")
+LOCATIONS = ("Madrid, Spain", "Barcelona, Spain", "London, United Kingdom", "Berlin, Germany", "Paris, France",
+             "Lisbon, Portugal", "Remote")
+COMPANIES = ("Initech", "Globex", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent")
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>LinkedIn Login</title></head><body>
+<form method="post" action="/login-submit">
+<input id="username" name="session_key" type="text"><input id="password" name="session_password" type="password">
+<button type="submit">Sign in</button>
+</form></body></html>"""
+
+FEED_PAGE = "<!DOCTYPE html><html><head><title>Feed</title></head><body><main>Feed</main></body></html>"
+
+
+@dataclass
+class Position:
+    title: str
+    duration: str
+
+
+@dataclass
+class Employment:
+    company: str
+    positions: List[Position]
+
+
+@dataclass
+class Person:
+    slug: str
+    name: str
+    headline: str
+    location: str
+    employments: List[Employment]
+
+
+class Site:
+    """Deterministic set of people working at a company, and the pages showing them."""
+
+    def __init__(self, company: str = "Acme", profiles: int = 200, max_positions: int = 12, seed: int = 1):
+        """
+        :param profiles: People found by the search, RESULTS_PER_PAGE per results page.
+        :param max_positions: Most positions a profile can have. Some profiles always get this many, to have long
+        experience sections.
+        """
+        self.company = company
+        self.base_url: str = ""
+        generator = random.Random(seed)
+        self.people: List[Person] = [self._person(generator, index, max_positions) for index in range(profiles)]
+        self._by_slug = {person.slug: person for person in self.people}
+
+    def _person(self, generator: random.Random, index: int, max_positions: int) -> Person:
+        name: str = f"{generator.choice(FIRST_NAMES)} {generator.choice(LAST_NAMES)}"
+        location: str = generator.choice(LOCATIONS)
+        positions: int = max_positions if index % 10 == 0 else generator.randint(1, max_positions)
+        employments: List[Employment] = []
+        year: int = 2023
+        while positions > 0:
+            company: str = self.company if not employments else generator.choice(COMPANIES)
+            count: int = min(positions, generator.choice((1, 1, 2, 3)))
+            employment = Employment(company, [])
+            for position_index in range(count):
+                start: int = year - generator.randint(1, 3)
+                end: str = "Present" if not employments and position_index == 0 else \
+                    f"{generator.choice(MONTHS)} {year}"
+                employment.positions.append(Position(
+                    generator.choice(POSITIONS), f"{generator.choice(MONTHS)} {start} - {end} · {year - start} yrs"))
+                year = start
+            employments.append(employment)
+            positions -= count
+        headline: str = f"{employments[0].positions[0].title} at {self.company}"
+        return Person(f"person-{index}", name, headline, location, employments)
+
+    @property
+    def pages(self) -> int:
+        return max((len(self.people) + RESULTS_PER_PAGE - 1) // RESULTS_PER_PAGE, 1)
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.base_url}/search/results/people/?keywords={self.company.lower()}"
+
+    def profile_url(self, person: Person) -> str:
+        return f"{self.base_url}/in/{person.slug}/"
+
+    def search_page(self, page: int) -> str:
+        people: List[Person] = self.people[(page - 1) * RESULTS_PER_PAGE:page * RESULTS_PER_PAGE]
+        cards: str = "\n".join(self._search_card(person) for person in people)
+        pagination: str = "".join(
+            f'<li class="artdeco-pagination__indicator artdeco-pagination__indicator--number">'
+            f'<button><span>{number}</span></button></li>'
+            for number in sorted({1, max(page - 1, 1), page, min(page + 1, self.pages), self.pages}))
+        return f"""<!DOCTYPE html>
+<html><head><title>Search</title></head><body><main>
+<div class="search-results-container"><h2>About {len(self.people):,} results</h2>
+<ul class="reusable-search__entity-result-list">
+{cards}
+</ul>
+<div class="artdeco-pagination"><ul class="artdeco-pagination__pages">{pagination}</ul></div>
+</div></main></body></html>"""
+
+    def _search_card(self, person: Person) -> str:
+        return f"""<li class="reusable-search__result-container"><div class="entity-result">
+<div class="entity-result__item">
+<div class="entity-result__universal-image"><a href="{self.profile_url(person)}"><div>Photo</div></a></div>
+<div class="entity-result__content"><div class="mb1">
+<div class="t-roman"><div class="display-flex"><span class="entity-result__title-text"><span class="app-aware-link">
+<a class="app-aware-link" href="{self.profile_url(person)}"><span dir="ltr"><span aria-hidden="true">{
+        html.escape(person.name)}</span></span></a></span></span></div></div>
+<div><div class="entity-result__primary-subtitle">{html.escape(person.headline)}</div>
+<div class="entity-result__secondary-subtitle">{html.escape(person.location)}</div></div>
+</div></div>
+</div></div></li>"""
+
+    def profile_page(self, slug: str) -> Optional[str]:
+        person: Optional[Person] = self._by_slug.get(slug)
+        if person is None:
+            return None
+        entities: str = self._experience_entities(person.employments[:SECTION_EXPERIENCES])
+        show_all: str = ""
+        if len(person.employments) > SECTION_EXPERIENCES:
+            show_all = f"""<div class="pvs-list__footer-wrapper">
+<a href="{self.profile_url(person)}details/experience/">Show all {len(person.employments)} experiences</a></div>"""
+        return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(person.name)}</title></head><body><main>
+<section class="artdeco-card"><div class="ph5"><div class="mt2"><h1 class="text-heading-xlarge">{
+        html.escape(person.name)}</h1>
+<div class="text-body-medium">{html.escape(person.headline)}</div>
+<div class="mt2"><span class="text-body-small">{html.escape(person.location)}</span></div></div></div></section>
+<section class="artdeco-card"><div id="about" class="pv-profile-card__anchor"></div>
+<div class="pvs-header"><h2>About</h2></div><div class="display-flex">Some words about {
+        html.escape(person.name)}.</div></section>
+<section class="artdeco-card"><div id="experience" class="pv-profile-card__anchor"></div>
+<div class="pvs-header"><h2><span aria-hidden="true">Experience</span></h2>
+<span class="visually-hidden">Experience</span></div>
+<div class="pvs-list__outer-container"><ul class="pvs-list">
+{entities}
+</ul>{show_all}</div></section>
+<section class="artdeco-card"><div id="education" class="pv-profile-card__anchor"></div>
+<div class="pvs-header"><h2>Education</h2></div><div>University</div></section>
+</main></body></html>"""
+
+    def experience_details_page(self, slug: str) -> Optional[str]:
+        person: Optional[Person] = self._by_slug.get(slug)
+        if person is None:
+            return None
+        return f"""<!DOCTYPE html>
+<html><head><title>{html.escape(person.name)} | Experience</title></head><body><main>
+<section class="artdeco-card"><div class="pvs-header"><h2>Experience</h2></div>
+<div class="scaffold-finite-scroll"><div class="scaffold-finite-scroll__content"><ul class="pvs-list">
+{self._experience_entities(person.employments)}
+</ul></div></div></section>
+</main></body></html>"""
+
+    def _experience_entities(self, employments: List[Employment]) -> str:
+        return "\n".join(
+            self._single_experience(employment) if len(employment.positions) == 1 else
+            self._multiple_experience(employment)
+            for employment in employments)
+
+    @staticmethod
+    def _single_experience(employment: Employment) -> str:
+        position: Position = employment.positions[0]
+        return f"""<li class="artdeco-list__item"><div class="pvs-entity">
+<div><a href="#"><div>Logo</div></a></div>
+<div class="display-flex flex-column full-width"><div class="display-flex flex-row justify-space-between">
+<div class="display-flex flex-column full-width">
+<div class="display-flex align-items-center"><span class="t-bold"><span aria-hidden="true">{
+        html.escape(position.title)}</span>
+<span class="visually-hidden">{html.escape(position.title)}</span></span></div>
+<span class="t-14 t-normal"><span aria-hidden="true">{html.escape(employment.company)} · Full-time</span>
+<span class="visually-hidden">{html.escape(employment.company)} · Full-time</span></span>
+<span class="t-14 t-normal t-black--light"><span aria-hidden="true">{html.escape(position.duration)}</span>
+<span class="visually-hidden">{html.escape(position.duration)}</span></span>
+</div></div></div></div></li>"""
+
+    @staticmethod
+    def _multiple_experience(employment: Employment) -> str:
+        positions: str = "\n".join(f"""<li><div class="pvs-entity">
+<div></div><div class="display-flex flex-column full-width"><div class="display-flex">
+<a class="optional-action-target-wrapper display-flex flex-column full-width" href="#">
+<div class="display-flex align-items-center"><span class="t-bold"><span aria-hidden="true">{
+            html.escape(position.title)}</span>
+<span class="visually-hidden">{html.escape(position.title)}</span></span></div>
+<span class="t-14 t-normal t-black--light"><span aria-hidden="true">{html.escape(position.duration)}</span>
+<span class="visually-hidden">{html.escape(position.duration)}</span></span></a></div></div></div></li>"""
+                                   for position in employment.positions)
+        return f"""<li class="artdeco-list__item"><div class="pvs-entity">
+<div><a href="#"><div>Logo</div></a></div>
+<div class="display-flex flex-column full-width"><div class="display-flex flex-row justify-space-between">
+<a class="optional-action-target-wrapper display-flex flex-column full-width" href="#">
+<div class="display-flex align-items-center"><span class="t-bold"><span aria-hidden="true">{
+            html.escape(employment.company)}</span><span class="visually-hidden">{
+            html.escape(employment.company)}</span></span></div></a></div>
+<div class="pvs-list__outer-container"><ul class="pvs-list">
+{positions}
+</ul></div></div></div></li>"""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    site: Site
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/login":
+            self._send(LOGIN_PAGE)
+        elif url.path.startswith("/feed"):
+            self._send(FEED_PAGE)
+        elif url.path == "/search/results/people/":
+            page: int = int(parse_qs(url.query).get("page", ["1"])[0])
+            self._send(self.site.search_page(page))
+        elif url.path.startswith("/in/"):
+            parts: List[str] = url.path.strip("/").split("/")
+            if parts[2:] == ["details", "experience"]:
+                page_html: Optional[str] = self.site.experience_details_page(parts[1])
+            else:
+                page_html = self.site.profile_page(parts[1])
+            if page_html is None:
+                self.send_error(404)
+            else:
+                self._send(page_html)
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(303)
+        self.send_header("Location", "/feed/")
+        self.send_header("Set-Cookie", "li_at=benchmark; Path=/; Max-Age=86400")
+        self.end_headers()
+
+    def _send(self, body: str) -> None:
+        content: bytes = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+@contextmanager
+def serve(site: Site, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """
+    Serve a site from a background thread.
+    :param port: Port to listen on, 0 to pick a free one.
+    :return: The base URL of the site.
+    """
+    handler = type("SiteHandler", (_Handler,), {"site": site})
+    server = ThreadingHTTPServer((host, port), handler)
+    address: Tuple[str, int] = server.server_address[:2]
+    site.base_url = f"http://{address[0]}:{address[1]}"
+    thread = threading.Thread(target=server.serve_forever, name="benchmark-site", daemon=True)
+    thread.start()
+    try:
+        yield site.base_url
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,48 @@
+"""
+Startup steps timed by the startup benchmark, each one run in a fresh interpreter, see `benchmarks.run.bench_startup`.
+
+    python -m benchmarks.startup window
+    python -m benchmarks.startup search BASE_URL SEARCH_URL SLEEP_TIME TIMEOUT
+
+Each step prints 'ready' once done. A search that can not start Chrome exits with BROWSER_UNAVAILABLE.
+"""
+import sys
+
+# Exit status of a search step that could not start Chrome
+BROWSER_UNAVAILABLE = 3
+
+
+def window() -> None:
+    """Show the main window, as the GUI entry point does."""
+    from PySide6.QtWidgets import QApplication
+
+    from veget.ui.main_window import MainWindow
+
+    app = QApplication([])
+    main_window = MainWindow()
+    main_window.show()
+    app.processEvents()
+    print("ready", flush=True)
+
+
+def search(base_url: str, search_url: str, sleep_time: str, timeout: str) -> None:
+    """Log in and extract the first results page of a search, as a job does once started."""
+    from selenium.common import WebDriverException
+
+    from veget.linkedin.client import LinkedIn
+
+    try:
+        li = LinkedIn("benchmark", "benchmark", sleep_time=int(sleep_time), timeout=int(timeout), lean=True,
+                      base_url=base_url)
+    except WebDriverException as e:
+        print(e.msg, file=sys.stderr)
+        sys.exit(BROWSER_UNAVAILABLE)
+    with li:
+        next(li.iter_search(search_url))
+        print("ready", flush=True)
+
+
+STEPS = {"window": window, "search": search}
+
+if __name__ == '__main__':
+    STEPS[sys.argv[1]](*sys.argv[2:])
@@ -0,0 +1,21 @@
+from veget.linkedin import Experience, Profile
+from veget.linkedin.cache import ProfileCache
+
+URL = "https://www.linkedin.com/in/ada/"
+PROFILE = Profile("Ada Lovelace", [Experience.from_duration("Acme", "Engineer", "Jan 2020 - Present", "London")])
+
+
+def test_cache_round_trip(tmp_path):
+    with ProfileCache(str(tmp_path / "profiles.sqlite")) as cache:
+        cache.put(URL, PROFILE)
+        assert cache.get(f"{URL}?trk=search") == PROFILE
+
+
+def test_opening_the_cache_purges_expired_profiles(tmp_path):
+    path = str(tmp_path / "profiles.sqlite")
+    with ProfileCache(path) as cache:
+        cache.put(URL, PROFILE)
+    with ProfileCache(path, ttl=-1):
+        pass
+    with ProfileCache(path) as cache:
+        assert cache.get(URL) is None
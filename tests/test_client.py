@@ -0,0 +1,7 @@
+from veget.linkedin.client import LinkedIn
+
+SEARCH_URL = "https://www.linkedin.com/search/results/people/?keywords=&origin=FACETED_SEARCH"
+
+
+def test_page_url_keeps_blank_parameters():
+    assert LinkedIn._page_url(f"{SEARCH_URL}&page=3", 4) == f"{SEARCH_URL}&page=4"
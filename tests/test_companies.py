@@ -0,0 +1,76 @@
+import pytest
+
+from veget.companies import CompanyIndex, normalize_company, parse_aliases
+from veget.linkedin import ProfileLink
+from veget.linkedin.dates import UNKNOWN
+
+
+@pytest.mark.parametrize("name", ["Acme", "Acme Inc.", "ACME", "Acme (acquired by Globex)", "Acme, Inc", "Ácme S.L."])
+def test_normalize_company(name):
+    assert normalize_company(name) == "acme"
+
+
+def test_normalize_company_keeps_a_lone_legal_word():
+    assert normalize_company("Company") == "company"
+    assert normalize_company("AT&T") == "at and t"
+
+
+@pytest.fixture
+def index():
+    return CompanyIndex(["Acme", "Globex"], {"Acme": ["Acme Robotics"]})
+
+
+def test_match(index):
+    assert index.match("ACME Inc.") == "Acme"
+    assert index.match("Acme Robotics GmbH") == "Acme"
+    assert index.match("Globex Corporation") == "Globex"
+    assert index.match("Initech") is None
+    assert index.matches("Acme", "Acme (acquired by Globex)")
+    assert not index.matches("Globex", "Acme")
+
+
+def test_companies_with_the_same_normalized_name(caplog):
+    index = CompanyIndex(["Acme Inc.", "ACME"])
+    assert "same name" in caplog.text
+    assert index.match("Acme") == "Acme Inc."
+    assert index.matches("Acme Inc.", "Acme") and index.matches("ACME", "Acme")
+
+
+@pytest.mark.parametrize("headline, role", [
+    ("Software Engineer at Acme", "Software Engineer"),
+    ("Software Engineer @ ACME Inc. | Speaker", "Software Engineer"),
+    ("Ingeniera de software en Acme, Madrid", "Ingeniera de software"),
+    ("Data Scientist bei Acme Robotics", "Data Scientist"),
+    ("Software Engineer at Globex", None),
+    ("Software Engineer", None),
+])
+def test_headline_role(index, headline, role):
+    assert index.headline_role("Acme", headline) == role
+
+
+@pytest.mark.parametrize("headline", [
+    "Former Software Engineer at Acme",
+    "Software Engineer, formerly at Acme",
+    "Ex-Software Engineer at Acme",
+    "Software Engineer at ex-Acme",
+    "Previously CTO at Acme",
+    "Antigua directora en Acme",
+    "Ancien ingénieur chez Acme",
+    "Ehemaliger Entwickler bei Acme",
+    "Voormalig manager bij Acme",
+])
+def test_headline_role_rejects_past_roles(index, headline):
+    assert index.headline_role("Acme", headline) is None
+
+
+def test_headline_profile(index):
+    profile = index.headline_profile("Acme", ProfileLink("Jane Doe", "CTO at Acme", "Madrid", "https://x/in/jane"))
+    assert profile.name == "Jane Doe"
+    [experience] = profile.experiences
+    assert (experience.company, experience.position, experience.start_date, experience.location) == \
+        ("Acme", "CTO", UNKNOWN, "Madrid")
+    assert index.headline_profile("Acme", ProfileLink("John Doe", "Former CTO at Acme", "Madrid", "u")) is None
+
+
+def test_parse_aliases():
+    assert parse_aliases(" Acme Robotics, ,ACME Labs ") == ("Acme Robotics", "ACME Labs")
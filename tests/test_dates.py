@@ -0,0 +1,86 @@
+import csv
+
+from datetime import date
+
+import pytest
+
+from veget.linkedin.dates import normalize_dates, normalize_csv, normalize_duration, normalize_rows, parse_date, split_duration, \
+    Tenure, UNKNOWN, UNKNOWN_TENURE
+
+TODAY = date(2023, 3, 15)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Jan 2020", (date(2020, 1, 1), True)),
+    ("ene. de 2020", (date(2020, 1, 1), True)),
+    ("févr. 2019", (date(2019, 2, 1), True)),
+    ("März 2018", (date(2018, 3, 1), True)),
+    ("2020", (date(2020, 1, 1), False)),
+    ("Present", (None, True)),
+    ("actualidad", (None, True)),
+    ("aujourd’hui", (None, True)),
+    (UNKNOWN, (None, False)),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+@pytest.mark.parametrize("duration, expected", [
+    ("Jan 2020 - Present · 3 yrs 3 mos", ("Jan 2020", "Present")),
+    ("Jan 2020 – Mar 2020", ("Jan 2020", "Mar 2020")),
+    ("Jan 2020—Mar 2020", ("Jan 2020", "Mar 2020")),
+    ("2018-2020", ("2018", "2020")),
+    ("ene. de 2020 - actualidad · 3 años", ("ene. de 2020", "actualidad")),
+    ("Mar 2021 · 1 mo", ("Mar 2021", "Mar 2021")),
+    ("3 yrs", (UNKNOWN, UNKNOWN)),
+])
+def test_split_duration(duration, expected):
+    assert split_duration(duration) == expected
+
+
+def test_year_only_range_counts_the_years_between():
+    assert normalize_duration("2018 - 2020", TODAY) == Tenure(date(2018, 1, 1), date(2020, 1, 1), False, 24)
+
+
+def test_single_date_lasts_a_month():
+    assert normalize_duration("Mar 2021 · 1 mo", TODAY) == Tenure(date(2021, 3, 1), date(2021, 3, 1), False, 1)
+
+
+@pytest.mark.parametrize("duration", ["Jan 2020 – Mar 2020", "Jan 2020—Mar 2020", "Jan 2020 - Mar 2020"])
+def test_dashes_count_both_months(duration):
+    assert normalize_duration(duration, TODAY) == Tenure(date(2020, 1, 1), date(2020, 3, 1), False, 3)
+
+
+def test_present_lasts_until_today():
+    assert normalize_duration("Jan 2020 - Present · 3 yrs 3 mos", TODAY) == Tenure(date(2020, 1, 1), None, True, 39)
+
+
+def test_spanish_present():
+    assert normalize_duration("ene. de 2020 - actualidad · 3 años 3 meses", TODAY) == \
+        Tenure(date(2020, 1, 1), None, True, 39)
+
+
+def test_end_before_start_has_no_tenure():
+    assert normalize_dates("Mar 2021", "Jan 2020", TODAY) == Tenure(date(2021, 3, 1), date(2020, 1, 1), False, None)
+
+
+def test_unknown_duration():
+    assert normalize_duration(None, TODAY) == UNKNOWN_TENURE
+    assert normalize_dates(UNKNOWN, UNKNOWN, TODAY) == UNKNOWN_TENURE
+
+
+def test_normalize_rows():
+    rows = [{"Start Date": "Jan 2020", "End Date": "Present"}, {"Start Date": "", "End Date": ""}]
+    assert [(row["Start"], row["End"], row["Tenure Months"]) for row in normalize_rows(rows, today=TODAY)] == [
+        ("2020-01-01", "", "39"),
+        ("", "", ""),
+    ]
+
+
+def test_normalize_csv_fills_existing_columns(tmp_path):
+    input_path, output_path = tmp_path / "job.csv", tmp_path / "normalized.csv"
+    input_path.write_text("Start Date,End Date,Start,End,Tenure Months\nJan 2020,Present,,,\n", encoding="utf-8")
+    assert normalize_csv(str(input_path), str(output_path), today=TODAY) == 1
+    with open(output_path, newline="", encoding="utf-8") as f:
+        assert list(csv.reader(f)) == [["Start Date", "End Date", "Start", "End", "Tenure Months"],
+                                       ["Jan 2020", "Present", "2020-01-01", "", "39"]]
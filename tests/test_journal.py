@@ -0,0 +1,83 @@
+import json
+
+from typing import List
+
+import pytest
+
+from veget.journal import JobJournal, resume_search
+from veget.linkedin import ProfileLink
+
+COMPANIES = [["Acme", "https://www.linkedin.com/search/results/people/"]]
+
+
+def link(slug: str) -> ProfileLink:
+    return ProfileLink(slug.title(), "Engineer at Acme", "Madrid", f"https://www.linkedin.com/in/{slug}/")
+
+
+class FakeSession:
+    """Session whose search has one page per list of profile links."""
+
+    def __init__(self, pages: List[List[ProfileLink]]):
+        self.pages = pages
+        self.start_pages: List[int] = []
+
+    def iter_search(self, search_url, start_page=1, on_pagination=None):
+        self.start_pages.append(start_page)
+        on_pagination(len(self.pages), sum(len(profile_links) for profile_links in self.pages))
+        for page in range(start_page, len(self.pages) + 1):
+            yield page, self.pages[page - 1]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "job.journal")
+
+
+def test_resume_from_the_journal(path):
+    with JobJournal(path) as journal:
+        journal.record_job(COMPANIES)
+        journal.record_page("Acme", 1, [link("ada"), link("bob")])
+        journal.record_profile("Acme", link("ada").url)
+    with JobJournal(path) as journal:
+        assert journal.resuming
+        assert journal.company_search == [tuple(entry) for entry in COMPANIES]
+        assert journal.company("Acme").done_profiles == {link("ada").url}
+        session = FakeSession([[link("ada"), link("bob")], [link("carol")]])
+        assert list(resume_search(session, journal, "Acme", COMPANIES[0][1])) == [link("ada"), link("bob"),
+                                                                                 link("carol")]
+        assert session.start_pages == [2]
+        assert journal.company("Acme").search_complete
+
+
+def test_skip_a_torn_last_line(path):
+    with JobJournal(path) as journal:
+        journal.record_job(COMPANIES)
+        journal.record_page("Acme", 1, [link("ada"), link("bob")])
+        journal.record_profile("Acme", link("ada").url)
+    # A crash cuts the last record while it is written
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"event": "profile", "company": "Acme", "url": link("bob").url})[:30])
+    with JobJournal(path) as journal:
+        assert journal.company("Acme").done_profiles == {link("ada").url}
+        journal.record_profile("Acme", link("bob").url)
+    # Records after the torn line start on a line of their own
+    with JobJournal(path) as journal:
+        assert journal.company("Acme").done_profiles == {link("ada").url, link("bob").url}
+
+
+def test_failed_profiles_are_not_done(path):
+    with JobJournal(path) as journal:
+        journal.record_job(COMPANIES)
+        journal.record_profile_failed("Acme", link("ada").url)
+    with JobJournal(path) as journal:
+        assert journal.company("Acme").failed_profiles == {link("ada").url}
+        assert journal.company("Acme").done_profiles == set()
+
+
+def test_in_memory_journal():
+    journal = JobJournal(None)
+    assert not journal.resuming
+    journal.record_job(COMPANIES)
+    journal.record_company_done("Acme")
+    assert journal.company("Acme").done
+    journal.discard()
@@ -0,0 +1,65 @@
+from typing import List
+
+from selenium.common import WebDriverException
+
+from veget.journal import JobJournal
+from veget.linkedin import Profile, ProfileLink
+from veget.linkedin.pool import LinkedInPool
+from veget.metrics import Metrics
+from veget.runner import JobCompany, JobRunner
+
+
+def link(slug: str) -> ProfileLink:
+    return ProfileLink(slug.title(), "Engineer at Acme", "Madrid", f"https://www.linkedin.com/in/{slug}/")
+
+
+class FakeSession:
+    """Session failing to get the profiles of the given names."""
+
+    def __init__(self, failing: List[str], profile_links: List[ProfileLink] = ()):
+        self.failing = failing
+        self.profile_links = list(profile_links)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def iter_search(self, search_url, start_page=1, on_pagination=None):
+        on_pagination(1, len(self.profile_links))
+        yield 1, self.profile_links
+
+    def get_profile(self, profile_link_, refresh=False):
+        if profile_link_.name in self.failing:
+            raise WebDriverException("Tab crashed")
+        return Profile(profile_link_.name, [])
+
+
+def test_pool_skips_failing_profiles():
+    sessions: List[FakeSession] = []
+
+    def new_session() -> FakeSession:
+        sessions.append(FakeSession(["Bob"]))
+        return sessions[-1]
+
+    with LinkedInPool(new_session, 2, max_retries=1) as pool:
+        profiles = list(pool.map_profiles([link("ada"), link("bob"), link("carol")]))
+    assert profiles == [(link("ada"), Profile("Ada", [])), (link("bob"), None), (link("carol"), Profile("Carol", []))]
+    # The failing session is replaced for the retry
+    assert len(sessions) > 2
+
+
+def test_job_goes_on_after_a_failing_profile(tmp_path):
+    path = str(tmp_path / "job.journal")
+    metrics = Metrics()
+    messages: List[str] = []
+    journal = JobJournal(path)
+    JobRunner(lambda: FakeSession(["Bob"], [link("ada"), link("bob"), link("carol")]),
+              [JobCompany("Acme", "https://www.linkedin.com/search/results/people/")], journal, metrics=metrics,
+              sessions=2, on_message=messages.append).run()
+    progress = journal.company("Acme")
+    assert progress.done_profiles == {link("ada").url, link("carol").url}
+    assert progress.failed_profiles == {link("bob").url}
+    assert metrics.summary()["counters"]["profiles_failed"] == 1
+    assert "Could not get profile 'Bob', skipping it" in messages
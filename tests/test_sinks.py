@@ -0,0 +1,172 @@
+import csv
+import json
+import os
+import sqlite3
+
+from datetime import date
+from typing import List
+
+import pytest
+
+from veget.linkedin import ProfileLink
+from veget.sinks import BackgroundWriter, CsvSink, DEFAULT_CSV_FIELDS, FIELDS, HEADERS, JsonlSink, open_sink, \
+    OutputRow, removed_row, Sink, SqliteSink
+
+LINK = ProfileLink("Ada Lovelace", "Engineer", "London", "https://www.linkedin.com/in/ada/")
+
+
+def row(role: str = "Engineer", removed: bool = False) -> OutputRow:
+    return OutputRow("Acme", LINK.name, role, LINK.location, "Jan 2020", "Present", LINK.url, date(2020, 1, 1), None,
+                     39, removed)
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_csv_has_the_normalized_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    sink = CsvSink(str(path))
+    sink.write(LINK.url, [row()])
+    sink.close()
+    assert read_csv(path) == [[HEADERS[field] for field in DEFAULT_CSV_FIELDS],
+                              ["Acme", "Ada Lovelace", "Engineer", "London", "Jan 2020", "Present", "2020-01-01", "",
+                               "39"]]
+
+
+def test_csv_appends_to_a_legacy_file_without_the_normalized_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("Company,Employee Name,Role,Based On,Start Date,End Date\n", encoding="utf-8")
+    sink = CsvSink(str(path), append=True)
+    sink.write(LINK.url, [row()])
+    sink.close()
+    assert read_csv(path)[1] == ["Acme", "Ada Lovelace", "Engineer", "London", "Jan 2020", "Present"]
+
+
+def test_csv_refuses_to_append_to_other_columns(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("Company,Role\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        CsvSink(str(path), append=True)
+
+
+def test_jsonl_has_every_field(tmp_path):
+    path = tmp_path / "out.jsonl"
+    sink = JsonlSink(str(path))
+    sink.write(LINK.url, [row(), row("Lead")])
+    sink.close()
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record["role"] for record in records] == ["Engineer", "Lead"]
+    assert list(records[0]) == list(FIELDS)
+    assert (records[0]["start"], records[0]["end"], records[0]["tenure_months"]) == ("2020-01-01", None, 39)
+
+
+def sqlite_rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT company, employee_name, role FROM profiles ORDER BY role").fetchall()
+    finally:
+        connection.close()
+
+
+def test_sqlite_replaces_the_rows_of_a_profile(tmp_path):
+    path = str(tmp_path / "out.sqlite")
+    sink = SqliteSink(path)
+    sink.write(LINK.url, [row(), row("Intern")])
+    sink.write(LINK.url, [row("Lead")])
+    sink.close()
+    assert sqlite_rows(path) == [("Acme", "Ada Lovelace", "Lead")]
+
+
+def test_sqlite_deletes_removed_profiles(tmp_path):
+    path = str(tmp_path / "out.sqlite")
+    sink = SqliteSink(path)
+    sink.write(LINK.url, [row()])
+    sink.close()
+    sink = SqliteSink(path, append=True)
+    sink.write(LINK.url, [removed_row("Acme", LINK)])
+    sink.close()
+    assert sqlite_rows(path) == []
+
+
+def test_sqlite_removal_without_company_deletes_every_experience(tmp_path):
+    path = str(tmp_path / "out.sqlite")
+    sink = SqliteSink(path)
+    sink.write(LINK.url, [row(), OutputRow("Globex", LINK.name, "Intern", "", "", "", LINK.url)])
+    sink.write(LINK.url, [removed_row(None, LINK)])
+    sink.close()
+    assert sqlite_rows(path) == []
+
+
+def test_parquet_keeps_flushed_rows_of_an_interrupted_job(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    sink = open_sink(path)
+    sink.write(LINK.url, [row()])
+    sink.flush()
+    sink.write(LINK.url, [row("Lead")])
+    sink.flush()
+    # Interrupted before closing, a resumed job merges the flushed parts
+    assert len(os.listdir(f"{path}.parts")) == 2
+    sink = open_sink(path, append=True)
+    sink.write(LINK.url, [row("Intern")])
+    sink.close()
+    assert not os.path.exists(f"{path}.parts")
+    table = parquet.read_table(path)
+    assert table.column_names == list(FIELDS)
+    assert table.column("role").to_pylist() == ["Engineer", "Lead", "Intern"]
+    assert table.column("start").to_pylist() == [date(2020, 1, 1)] * 3
+
+
+def test_parquet_discards_the_parts_of_a_job_not_resumed(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    sink = open_sink(path)
+    sink.write(LINK.url, [row()])
+    sink.flush()
+    sink = open_sink(path)
+    sink.write(LINK.url, [row("Lead")])
+    sink.close()
+    assert parquet.read_table(path).column("role").to_pylist() == ["Lead"]
+
+
+def test_open_sink_refuses_unknown_formats(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(str(tmp_path / "out.xlsx"))
+
+
+class RecordingSink(Sink):
+    def __init__(self, events: List[str]):
+        self.events = events
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        self.events.extend(f"write {output_row.role}" for output_row in rows)
+
+    def flush(self) -> None:
+        self.events.append("flush")
+
+    def close(self) -> None:
+        self.events.append("close")
+
+
+def test_background_writer_calls_back_once_flushed():
+    events: List[str] = []
+    with BackgroundWriter(RecordingSink(events), flush_rows=2, flush_interval=60) as writer:
+        for role in ("Engineer", "Lead", "Intern"):
+            writer.write(LINK.url, [row(role)], on_flushed=lambda role=role: events.append(f"flushed {role}"))
+        writer.when_flushed(lambda: events.append("flushed all"))
+    assert events == ["write Engineer", "write Lead", "flush", "flushed Engineer", "flushed Lead", "write Intern",
+                      "flush", "flushed Intern", "flushed all", "close"]
+
+
+class FailingSink(Sink):
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        raise OSError("Disk full")
+
+
+def test_background_writer_raises_the_sink_error():
+    writer = BackgroundWriter(FailingSink(), flush_interval=60)
+    writer.write(LINK.url, [row()])
+    with pytest.raises(RuntimeError):
+        writer.close()
@@ -0,0 +1,113 @@
+import csv
+
+from typing import Dict, List, Tuple
+
+import pytest
+
+from veget.journal import CompanyProgress, JobJournal
+from veget.linkedin import Experience, Profile, ProfileLink
+from veget.linkedin.cache import normalize_profile_url
+from veget.runner import JobCompany, JobRunner
+from veget.sinks import DELTA_CSV_FIELDS, HEADERS
+from veget.snapshots import SnapshotDiff, SnapshotStore
+
+
+def link(slug: str, position: str = "Engineer at Acme", location: str = "Madrid") -> ProfileLink:
+    return ProfileLink(slug.title(), position, location, f"https://www.linkedin.com/in/{slug}/")
+
+
+class FakeSession:
+    """Session whose search finds the given profile links in a single page, out of last_page pages."""
+
+    def __init__(self, profile_links: List[ProfileLink], last_page: int = 1):
+        self.profile_links = profile_links
+        self.last_page = last_page
+        self.visited: List[Tuple[str, bool]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+    def iter_search(self, search_url, start_page=1, on_pagination=None):
+        on_pagination(self.last_page, len(self.profile_links))
+        yield 1, self.profile_links
+
+    def get_profile(self, profile_link_, refresh=False):
+        self.visited.append((profile_link_.name, refresh))
+        return Profile(profile_link_.name, [Experience.from_duration("Acme", "Engineer", "Jan 2020 - Present", "")])
+
+
+@pytest.fixture
+def store():
+    with SnapshotStore(":memory:") as store:
+        yield store
+
+
+def run_delta(store: SnapshotStore, session: FakeSession, output: str) -> List[Dict[str, str]]:
+    JobRunner(lambda: session, [JobCompany("Acme", "https://www.linkedin.com/search/results/people/")],
+              JobJournal(None), output, snapshots=store, on_message=lambda message: None).run()
+    with open(output, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def test_diff_against_the_previous_search():
+    previous = {normalize_profile_url(profile_link.url): profile_link
+                for profile_link in (link("ada"), link("bob"), link("eve"))}
+    diff = SnapshotDiff(previous)
+    assert not diff.needs_visit(ProfileLink("Ada", "Engineer at Acme", "Madrid",
+                                            "https://www.linkedin.com/in/ada/?trk=search"))
+    assert diff.needs_visit(link("bob", position="Lead at Acme"))
+    assert diff.needs_visit(link("carol"))
+    # Found twice by the search
+    assert not diff.needs_visit(link("carol"))
+    assert (diff.added, diff.changed, diff.unchanged) == (1, 1, 1)
+    assert diff.is_changed(link("bob")) and not diff.is_changed(link("carol"))
+    assert diff.removed() == [link("eve")]
+
+
+def test_store_replaces_snapshots(store):
+    assert store.load("Acme") == {}
+    store.replace("Acme", [link("ada"), link("bob")])
+    store.replace("Acme", [link("bob")])
+    store.replace("Globex", [link("ada")])
+    assert store.load("Acme") == {normalize_profile_url(link("bob").url): link("bob")}
+    assert store.diff("Globex").removed() == [link("ada")]
+
+
+@pytest.mark.parametrize("pages, links, last_page, results_count, complete", [
+    ({1, 2}, 20, 2, 20, True),
+    ({1, 2}, 19, 2, 20, True),
+    ({1}, 10, 2, 20, False),
+    ({1, 2}, 10, 2, 20, False),
+    ({1, 2}, 20, None, None, False),
+])
+def test_search_complete(pages, links, last_page, results_count, complete):
+    progress = CompanyProgress([link(f"p{number}") for number in range(links)], pages, True, last_page, results_count)
+    assert progress.search_complete is complete
+
+
+def test_search_not_done_is_incomplete():
+    assert not CompanyProgress([link("ada")], {1}, False, 1, 1).search_complete
+
+
+def test_delta_job_writes_the_changes(store, tmp_path):
+    output = str(tmp_path / "acme.csv")
+    run_delta(store, FakeSession([link("ada"), link("bob"), link("eve")]), output)
+    session = FakeSession([link("ada"), link("bob", position="Lead at Acme"), link("carol")])
+    rows = run_delta(store, session, output)
+    assert list(rows[0]) == [HEADERS[field] for field in DELTA_CSV_FIELDS]
+    assert session.visited == [("Bob", True), ("Carol", False)]
+    assert [(row["Employee Name"], row["Removed"]) for row in rows[3:]] == [
+        ("Bob", "False"), ("Carol", "False"), ("Eve", "True")]
+    assert set(store.load("Acme")) == {normalize_profile_url(link(slug).url) for slug in ("ada", "bob", "carol")}
+
+
+def test_partial_search_does_not_remove_profiles(store, tmp_path):
+    output = str(tmp_path / "acme.csv")
+    run_delta(store, FakeSession([link("ada"), link("bob")]), output)
+    # The search stops at its first page out of two
+    rows = run_delta(store, FakeSession([link("ada")], last_page=2), output)
+    assert [row["Removed"] for row in rows] == ["False", "False"]
+    assert set(store.load("Acme")) == {normalize_profile_url(link(slug).url) for slug in ("ada", "bob")}
@@ -0,0 +1,58 @@
+# -*- mode: python ; coding: utf-8 -*-
+"""
+PyInstaller build of the GUI, tuned for startup time:
+
+    pyinstaller veget.spec
+
+It builds a onedir bundle in dist/veget: a onefile executable unpacks itself to a temporary directory on every launch,
+which takes seconds before the window shows up. The bundle is neither compressed with UPX, which would be undone on
+every launch too, nor carries the Qt modules the GUI does not use.
+"""
+
+# Qt modules the GUI does not use, the ones it does are QtCore, QtGui and QtWidgets
+QT_EXCLUDES = [
+    f"PySide6.{module}" for module in (
+        "Qt3DAnimation", "Qt3DCore", "Qt3DExtras", "Qt3DInput", "Qt3DLogic", "Qt3DRender", "QtBluetooth", "QtCharts",
+        "QtConcurrent", "QtDataVisualization", "QtDBus", "QtDesigner", "QtHelp", "QtHttpServer", "QtLocation",
+        "QtMultimedia", "QtMultimediaWidgets", "QtNetwork", "QtNetworkAuth", "QtNfc", "QtOpenGL", "QtOpenGLWidgets",
+        "QtPdf", "QtPdfWidgets", "QtPositioning", "QtPrintSupport", "QtQml", "QtQuick", "QtQuick3D", "QtQuickControls2",
+        "QtQuickWidgets", "QtRemoteObjects", "QtScxml", "QtSensors", "QtSerialBus", "QtSerialPort", "QtSpatialAudio",
+        "QtSql", "QtStateMachine", "QtSvg", "QtSvgWidgets", "QtTest", "QtTextToSpeech", "QtUiTools", "QtWebChannel",
+        "QtWebEngineCore", "QtWebEngineQuick", "QtWebEngineWidgets", "QtWebSockets", "QtXml",
+    )
+]
+
+a = Analysis(
+    ["veget/ui/__main__.py"],
+    pathex=[],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=[*QT_EXCLUDES, "tkinter", "benchmarks"],
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name="veget",
+    icon="vege.ico",
+    debug=False,
+    strip=False,
+    upx=False,
+    console=False,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name="veget",
+)
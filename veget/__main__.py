@@ -1,8 +1,20 @@
 import logging
 
+from functools import partial
+from typing import List, TYPE_CHECKING
+
 import click
 
-from .linkedin import LinkedIn
+from .journal import JobJournal
+from .linkedin import ProfileCache, DEFAULT_BASE_URL
+from .linkedin.cache import DEFAULT_TTL, DEFAULT_MAX_ENTRIES
+from .linkedin.session import SessionStore
+from .metrics import Metrics, profiled
+from .runner import JobCompany, JobRunner, load_job_file
+from .snapshots import SnapshotStore
+
+if TYPE_CHECKING:
+    from .linkedin.client import LinkedIn
 
 
 logging.basicConfig(level=logging.INFO)
@@ -11,15 +23,97 @@ logging.basicConfig(level=logging.INFO)
 @click.command()
 @click.option('--username', prompt='LinkedIn username',)
 @click.option('--password', prompt='LinkedIn password', hide_input=True)
-@click.option('--search-url', prompt='Linkedin company URL')
-@click.option('--sleep-time', prompt='Time to sleep between page loads', default=5)
+@click.option('--search-url', default=None, help='LinkedIn search of the company, asked for without a job file')
+@click.option('--job-file', default=None, type=click.Path(exists=True, dir_okay=False),
+              help='CSV or JSON file listing the companies to scrape and their search URLs, see veget.runner')
+@click.option('--concurrency', default=1, help='Companies of the job file scraped at the same time')
+@click.option('--sleep-time', prompt='Maximum time to wait for each page load', default=5)
 @click.option('--timeout', prompt='Timeout looking for web elements', default=10)
-def main(username, password, search_url, sleep_time, timeout):
-    with LinkedIn(username, password, sleep_time=sleep_time, timeout=timeout) as li:
-        profiles = li.search(search_url)
-        logging.info(f"Found {len(profiles)} profiles")
-        for i, profile in enumerate(profiles):
-            logging.info(f"[{i}] {li.get_profile(profile)}")
+@click.option('--cache', 'cache_file', default=None, type=click.Path(dir_okay=False),
+              help='SQLite file caching scraped profiles between runs')
+@click.option('--cache-ttl', default=DEFAULT_TTL // 3600, help='Hours a cached profile is reused')
+@click.option('--cache-size', default=DEFAULT_MAX_ENTRIES, help='Maximum number of cached profiles')
+@click.option('--journal', 'journal_file', default=None, type=click.Path(dir_okay=False),
+              help='Journal file to checkpoint the progress to, and resume from if it exists')
+@click.option('--sessions', default=1, help='Number of concurrent browser sessions visiting the profiles of a company')
+@click.option('--session-file', default=None, type=click.Path(dir_okay=False),
+              help='Encrypted file to keep the login session in between runs')
+@click.option('--browser-profile', default=None, type=click.Path(file_okay=False),
+              help='Chrome profile directory of the searching session, kept between runs')
+@click.option('--lean', is_flag=True, help='Run a headless browser that skips images, fonts, media and tracking')
+@click.option('--snapshots', 'snapshot_file', default=None, type=click.Path(dir_okay=False),
+              help='SQLite file with the search results of the previous job: only new or changed profiles are '
+                   'visited, and profiles no longer found are written as removed')
+@click.option('--compact-links', is_flag=True,
+              help='Keep the profile links found in columns instead of objects, for searches with many results')
+@click.option('--output', default=None, type=click.Path(dir_okay=False),
+              help='File to write the experiences to: .csv, .jsonl, .parquet or .sqlite')
+@click.option('--company', default=None,
+              help='Only write the experiences in this company, instead of every experience of the profiles')
+@click.option('--alias', 'aliases', multiple=True, help='Other name of the company, can be given several times')
+@click.option('--headline-only', is_flag=True,
+              help='Skip visiting the profiles whose search result headline already names the company, '
+                   'leaving their dates unknown')
+@click.option('--metrics-out', default=None, type=click.Path(dir_okay=False),
+              help='JSON file to write stage timings and driver command counts to')
+@click.option('--trace-out', default=None, type=click.Path(dir_okay=False),
+              help='Chrome trace file of every timed stage, for chrome://tracing or Perfetto')
+@click.option('--profile-out', default=None, type=click.Path(dir_okay=False),
+              help='cProfile stats file of the main thread')
+@click.option('--full-experience', is_flag=True,
+              help='Open the experience details page of the profiles that do not show all of their experiences')
+@click.option('--page-source/--no-page-source', default=True,
+              help='Parse each page from a single read of its HTML, looking its elements up one by one only when '
+                   'that finds nothing')
+@click.option('--pages-dir', default=None, type=click.Path(file_okay=False),
+              help='Directory to save the HTML of every visited profile page in, to parse it again offline with '
+                   'python -m veget.reparse')
+@click.option('--base-url', default=DEFAULT_BASE_URL, help='LinkedIn address, to run against a stand-in site')
+def main(username, password, search_url, job_file, concurrency, sleep_time, timeout, cache_file, cache_ttl,
+         cache_size, journal_file, sessions, session_file, browser_profile, lean, snapshot_file, compact_links, output,
+         company, aliases, headline_only, metrics_out, trace_out, profile_out, full_experience, page_source, pages_dir,
+         base_url):
+    if job_file is not None:
+        if search_url is not None or company is not None:
+            raise click.UsageError("--job-file already lists the companies, drop --search-url and --company")
+        companies: List[JobCompany] = load_job_file(job_file)
+    else:
+        if headline_only and company is None:
+            raise click.UsageError("--headline-only needs the --company to look for in the headlines")
+        if search_url is None:
+            search_url = click.prompt('Linkedin company URL')
+        # Without a company, the search is the company, and every experience of its profiles is written
+        companies = [JobCompany(company if company is not None else search_url, search_url, aliases)]
+    if browser_profile is not None and concurrency > 1:
+        raise click.UsageError("--browser-profile can only be used by one browser, it needs --concurrency 1")
+
+    cache = ProfileCache(cache_file, ttl=cache_ttl * 3600, max_entries=cache_size) if cache_file else None
+    journal = JobJournal(journal_file, compact_links=compact_links)
+    if journal.resuming:
+        logging.info(f"Resuming from journal {journal_file}")
+    session_store = SessionStore(session_file, username, password) if session_file else None
+    metrics = Metrics(trace=trace_out is not None)
+    snapshots = SnapshotStore(snapshot_file) if snapshot_file else None
+
+    def new_session(browser_profile_dir=None) -> "LinkedIn":
+        # Selenium is only imported once the first session starts
+        from .linkedin.client import LinkedIn
+        return LinkedIn(username, password, sleep_time=sleep_time, timeout=timeout, cache=cache,
+                        session_store=session_store, browser_profile_dir=browser_profile_dir, lean=lean,
+                        metrics=metrics, base_url=base_url, full_experience=full_experience,
+                        page_source_extraction=page_source, snapshot_dir=pages_dir)
+
+    runner = JobRunner(new_session, companies, journal, output, metrics=metrics, sessions=sessions,
+                       concurrency=concurrency, headline_only=headline_only,
+                       every_experience=job_file is None and company is None,
+                       new_search_session=partial(new_session, browser_profile), snapshots=snapshots)
+    with profiled(profile_out):
+        runner.run()
+
+    if metrics_out is not None:
+        metrics.dump(metrics_out)
+    if trace_out is not None:
+        metrics.dump_trace(trace_out)
 
 
 if __name__ == '__main__':
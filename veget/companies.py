@@ -0,0 +1,118 @@
+"""Matching of the company names found in profiles against the companies of a job."""
+import logging
+import re
+import unicodedata
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .linkedin import Experience, Profile, ProfileLink
+from .linkedin.dates import UNKNOWN
+
+# Legal forms left out when comparing company names, only at the end of the name
+LEGAL_SUFFIXES = frozenset(
+    "inc incorporated llc llp lp ltd limited corp corporation co company plc gmbh mbh ag kg kgaa se sa sas sarl sl slu "
+    "srl spa bv nv ab as asa oy oyj pty lda ltda".split())
+
+# Words introducing the company in a headline like 'Software Engineer at Acme', in the languages of dates.MONTHS
+HEADLINE_COMPANY = re.compile(r"^(?P<role>.+?)\s+(?:at|@|en|chez|bei|presso|na|no|em|bij)\s+(?P<company>.+)$",
+                              re.IGNORECASE)
+# Text after these separators in a headline is not part of the company name
+HEADLINE_SEPARATORS = re.compile(r"\s+[|·•/–—-]\s+|,\s+")
+# Words telling a headline role is a past one, like 'Former Engineer at Acme' or 'Ingeniero en ex-Acme'
+PAST_EMPLOYMENT = re.compile(r"\b(?:former(?:ly)?|ex|previously|past|antigu[oa]|antigo|anteriormente|ancien(?:ne)?|"
+                             r"anciennement|ehemalige?[mnrs]?|fr[uü]her|voormalige?)\b", re.IGNORECASE)
+
+_PARENTHESES = re.compile(r"\([^)]*\)|\[[^]]*]")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+@lru_cache(maxsize=65536)
+def normalize_company(name: str) -> str:
+    """
+    Normalize a company name for comparison: 'Acme Inc.', 'ACME' and 'Acme (acquired by Globex)' are all 'acme'.
+    :return: The lowercase words of the name without accents, punctuation, parenthesized notes or legal form.
+    """
+    folded: str = "".join(character for character in unicodedata.normalize("NFKD", name.casefold())
+                          if not unicodedata.combining(character))
+    folded = _PARENTHESES.sub(" ", folded).replace("&", " and ").replace(".", "")
+    words: List[str] = _WORD.findall(folded)
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+class CompanyIndex:
+    """
+    Companies of a job, with their aliases, indexed by normalized name. Built once per job, so matching an
+    experience is a lookup of its memoized normalized company name.
+    """
+
+    def __init__(self, companies: Iterable[str] = (), aliases: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        :param companies: Names of the companies, as given in the job.
+        :param aliases: Other names each company goes by.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        # Companies of the job by normalized name, several when their names only differ in case or legal form
+        self._companies: Dict[str, List[str]] = {}
+        for company in companies:
+            self.add(company, (aliases or {}).get(company, ()))
+
+    def add(self, company: str, aliases: Iterable[str] = ()) -> None:
+        """
+        Index a company under its name and aliases. A name already indexed for another company keeps referring to
+        both, matching finds the first one.
+        """
+        for name in (company, *aliases):
+            key: str = normalize_company(name)
+            if not key:
+                continue
+            companies: List[str] = self._companies.setdefault(key, [])
+            if company in companies:
+                continue
+            if companies:
+                self.logger.warning(f"'{name}' of {company} is the same name as {', '.join(companies)} once "
+                                    f"normalized, experiences there are matched to {companies[0]}")
+            companies.append(company)
+
+    def match(self, name: str) -> Optional[str]:
+        """
+        Find the company a name refers to.
+        :return: The company as given in the job, or None if the name is not one of the companies.
+        """
+        companies: List[str] = self._companies.get(normalize_company(name), [])
+        return companies[0] if companies else None
+
+    def matches(self, company: str, name: str) -> bool:
+        """Whether a name refers to the given company of the job, even if it refers to others too."""
+        return company in self._companies.get(normalize_company(name), ())
+
+    def headline_role(self, company: str, headline: str) -> Optional[str]:
+        """
+        Read the role in a company from a headline like 'Software Engineer at Acme | Speaker'.
+        :return: The role, or None if the headline does not name the company or may tell about a past role.
+        """
+        found = HEADLINE_COMPANY.match(headline.strip())
+        if found is None or PAST_EMPLOYMENT.search(headline) is not None:
+            return None
+        if not self.matches(company, HEADLINE_SEPARATORS.split(found.group("company"), maxsplit=1)[0]):
+            return None
+        return found.group("role").strip()
+
+    def headline_profile(self, company: str, profile_link_: ProfileLink) -> Optional[Profile]:
+        """
+        Build the profile of a search result from its headline, when it already tells the role in the company, so
+        the profile does not need to be visited. Dates are unknown.
+        :return: The profile, or None if the profile has to be visited.
+        """
+        role: Optional[str] = self.headline_role(company, profile_link_.position)
+        if role is None:
+            return None
+        return Profile(profile_link_.name, [Experience.from_dates(company, role, UNKNOWN, UNKNOWN,
+                                                                  profile_link_.location)])
+
+
+def parse_aliases(text: str) -> Tuple[str, ...]:
+    """Split a comma separated list of aliases."""
+    return tuple(alias.strip() for alias in text.split(",") if alias.strip())
@@ -0,0 +1,219 @@
+"""Journal of scraping jobs, so an interrupted job can be resumed from its last checkpoint."""
+import dataclasses
+import json
+import logging
+import os
+import threading
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TYPE_CHECKING, Union
+
+from .linkedin.profile_link import ProfileLink
+from .linkedin.profile_link_store import ProfileLinkStore
+
+if TYPE_CHECKING:
+    from .linkedin.client import LinkedIn
+
+# Share of the results count a search must find to be complete, as LinkedIn only gives an estimate of it
+COMPLETE_SEARCH_RATIO = 0.9
+
+
+@dataclass
+class CompanyProgress:
+    """What has already been done for a company of a job."""
+    # The profile links collected so far, in search order
+    profile_links: Union[List[ProfileLink], ProfileLinkStore] = field(default_factory=list)
+    # Search results pages whose profile links have been collected
+    pages: Set[int] = field(default_factory=set)
+    search_done: bool = False
+    # Pagination read by the last run of the search, None when unknown
+    last_page: Optional[int] = None
+    results_count: Optional[int] = None
+    done_profiles: Set[str] = field(default_factory=set)
+    # Profiles that could not be visited, not done so resuming the company visits them again
+    failed_profiles: Set[str] = field(default_factory=set)
+    done: bool = False
+
+    def add_page(self, page: int, profile_links: List[ProfileLink]) -> None:
+        # Pages are searched in order, each one once
+        if page not in self.pages:
+            self.pages.add(page)
+            self.profile_links.extend(profile_links)
+
+    @property
+    def next_page(self) -> int:
+        """The first search results page not completed yet."""
+        return max(self.pages, default=0) + 1
+
+    @property
+    def search_complete(self) -> bool:
+        """
+        Whether the search went through its last results page and found about as many profile links as it has results.
+        A search stopping at an empty page before that, such as a rate limited one, only found part of them.
+        """
+        if not self.search_done or self.last_page is None or self.results_count is None:
+            return False
+        return (max(self.pages, default=0) >= self.last_page
+                and len(self.profile_links) >= COMPLETE_SEARCH_RATIO * self.results_count)
+
+
+class JobJournal:
+    """
+    Append-only JSON lines journal of a scraping job.
+
+    Records the job definition, every completed search page with its profile links, every finished or failed profile and
+    every finished company. Each record is flushed as soon as it is written, so the journal survives a crash at any point.
+    """
+
+    def __init__(self, path: Optional[str], compact_links: bool = False):
+        """
+        :param path: Journal file, loaded if it exists. With None, progress is only tracked in memory.
+        :param compact_links: Keep the profile links of each company in a column-backed ProfileLinkStore, for searches
+        with hundreds of thousands of results.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.path = path
+        self.compact_links: bool = compact_links
+        self.company_search: Optional[List[Tuple[str, str]]] = None
+        self.companies: Dict[str, CompanyProgress] = {}
+        # Records may come from the output writer thread too
+        self._lock = threading.Lock()
+        self._file = None
+        if path is None:
+            return
+        complete_last_line: bool = True
+        if os.path.exists(path):
+            complete_last_line = self._load()
+        self._file = open(path, "a", encoding="utf-8")
+        if not complete_last_line:
+            self._file.write("\n")
+
+    @staticmethod
+    def path_for(ofile: str) -> str:
+        """The journal path of a job writing to the given output file."""
+        return f"{ofile}.journal"
+
+    @property
+    def resuming(self) -> bool:
+        """Whether the journal comes from a previous, unfinished run of the job."""
+        return self.company_search is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Remove the journal, once the job has finished."""
+        self.close()
+        if self.path is not None:
+            os.remove(self.path)
+
+    def company(self, company: str) -> CompanyProgress:
+        if company not in self.companies:
+            self.companies[company] = CompanyProgress(ProfileLinkStore() if self.compact_links else [])
+        return self.companies[company]
+
+    def record_job(self, company_search: List[Tuple[str, str]]) -> None:
+        self.company_search = [tuple(entry) for entry in company_search]
+        self._write({"event": "job", "companies": company_search})
+
+    def record_page(self, company: str, page: int, profile_links: List[ProfileLink]) -> None:
+        self.company(company).add_page(page, profile_links)
+        self._write({
+            "event": "page",
+            "company": company,
+            "page": page,
+            "links": [dataclasses.asdict(profile_link) for profile_link in profile_links]
+        })
+
+    def record_search_done(self, company: str, last_page: Optional[int] = None,
+                           results_count: Optional[int] = None) -> None:
+        progress: CompanyProgress = self.company(company)
+        progress.search_done = True
+        progress.last_page = last_page
+        progress.results_count = results_count
+        self._write({"event": "search_done", "company": company, "last_page": last_page,
+                     "results_count": results_count})
+
+    def record_profile(self, company: str, url: str) -> None:
+        self.company(company).done_profiles.add(url)
+        self._write({"event": "profile", "company": company, "url": url})
+
+    def record_profile_failed(self, company: str, url: str) -> None:
+        self.company(company).failed_profiles.add(url)
+        self._write({"event": "profile_failed", "company": company, "url": url})
+
+    def record_company_done(self, company: str) -> None:
+        self.company(company).done = True
+        self._write({"event": "company_done", "company": company})
+
+    def _write(self, record: dict) -> None:
+        if self._file is None:
+            return
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def _load(self) -> bool:
+        """
+        Load the progress recorded by a previous run.
+        :return: Whether the last line of the journal is complete.
+        """
+        with open(self.path, encoding="utf-8") as f:
+            content: str = f.read()
+            for line in content.splitlines():
+                try:
+                    record: dict = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line cut by a crash
+                    self.logger.warning(f"Ignoring corrupt journal line: {line!r}")
+                    continue
+                event: str = record["event"]
+                if event == "job":
+                    self.company_search = [tuple(entry) for entry in record["companies"]]
+                elif event == "page":
+                    self.company(record["company"]).add_page(
+                        record["page"], [ProfileLink(**link) for link in record["links"]])
+                elif event == "search_done":
+                    progress: CompanyProgress = self.company(record["company"])
+                    progress.search_done = True
+                    progress.last_page = record.get("last_page")
+                    progress.results_count = record.get("results_count")
+                elif event == "profile":
+                    self.company(record["company"]).done_profiles.add(record["url"])
+                elif event == "profile_failed":
+                    self.company(record["company"]).failed_profiles.add(record["url"])
+                elif event == "company_done":
+                    self.company(record["company"]).done = True
+        self.logger.info(f"Loaded journal {self.path} with {len(self.companies)} companies.")
+        return not content or content.endswith("\n")
+
+
+def resume_search(li: "LinkedIn", journal: JobJournal, company: str, search_url: str,
+                  on_results_count: Optional[Callable[[int], None]] = None) -> Iterator[ProfileLink]:
+    """
+    Stream the profile links of a company search: first the ones already in the journal, then the ones of the pages
+    not searched yet, checkpointing each page as it arrives. The pagination of the search is recorded with its end, see
+    `CompanyProgress.search_complete`.
+    """
+    progress: CompanyProgress = journal.company(company)
+    yield from progress.profile_links
+    if progress.search_done:
+        return
+    pagination: List[int] = []
+
+    def on_pagination(last_page: int, results_count: int) -> None:
+        pagination[:] = [last_page, results_count]
+        if on_results_count is not None:
+            on_results_count(results_count)
+
+    for page, profile_links in li.iter_search(search_url, start_page=progress.next_page, on_pagination=on_pagination):
+        journal.record_page(company, page, profile_links)
+        yield from profile_links
+    journal.record_search_done(company, *pagination)
@@ -0,0 +1,65 @@
+"""Creation of the browser driven by the scraper."""
+from typing import Optional, Sequence
+
+from selenium import webdriver
+
+
+# Resources the extraction never reads: images, fonts, media and tracking
+BLOCKED_URL_PATTERNS = (
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*media.licdn.com*", "*dms.licdn.com*",
+    "*px.ads.linkedin.com*", "*linkedin.com/li/track*", "*linkedin.com/sensorCollect*",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*", "*bat.bing.com*",
+)
+
+# Chrome arguments trimming the features a scraping browser does not need
+LEAN_ARGUMENTS = (
+    "--headless=new",
+    "--window-size=1280,1024",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-notifications",
+    "--mute-audio",
+    "--no-first-run",
+    "--blink-settings=imagesEnabled=false",
+)
+
+
+def create_driver(profile_dir: Optional[str] = None, lean: bool = False,
+                  blocked_urls: Sequence[str] = BLOCKED_URL_PATTERNS) -> webdriver.Chrome:
+    """
+    Create the Chrome browser.
+    :param profile_dir: Chrome user data directory to keep the browser profile in between runs. Each concurrent
+    browser needs its own directory.
+    :param lean: Run headless with a trimmed set of features, without loading the resources matching `blocked_urls`.
+    :param blocked_urls: URL patterns, with `*` wildcards, not loaded in lean mode.
+    :return: The browser driver.
+    """
+    options = webdriver.ChromeOptions()
+    if profile_dir is not None:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    if lean:
+        for argument in LEAN_ARGUMENTS:
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+    driver = webdriver.Chrome(options=options)
+    if lean:
+        block_urls(driver, blocked_urls)
+    return driver
+
+
+def block_urls(driver: webdriver.Chrome, blocked_urls: Sequence[str] = BLOCKED_URL_PATTERNS) -> None:
+    """Stop the current tab of the browser from loading the resources matching the given URL patterns."""
+    if not blocked_urls:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(blocked_urls)})
@@ -0,0 +1,126 @@
+"""Persistent cache of scraped profiles."""
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from time import time
+from typing import Optional
+from urllib.parse import urlsplit, urlunsplit
+
+from .experience import Experience
+from .profile import Profile
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".veget", "profiles.sqlite")
+DEFAULT_TTL = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 100_000
+
+
+def normalize_profile_url(url: str) -> str:
+    """
+    Normalize a profile URL, so the same profile found from different searches gets the same key.
+    :return: The URL without query, fragment or trailing slash, and with a lower case host.
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit(("https", parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+# Fields stored for each experience, the normalized dates are derived from them when loading
+_EXPERIENCE_FIELDS = ("company", "position", "start_date", "end_date", "location")
+
+
+def _serialize(profile: Profile) -> dict:
+    return {
+        "name": profile.name,
+        "experiences": [{field: getattr(experience, field) for field in _EXPERIENCE_FIELDS}
+                        for experience in profile.experiences],
+    }
+
+
+class ProfileCache:
+    """SQLite backed cache of parsed profiles keyed by normalized profile URL."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES):
+        """
+        :param path: SQLite database file.
+        :param ttl: Seconds a cached profile is considered fresh.
+        :param max_entries: Maximum number of cached profiles, the least recently used ones are evicted first.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    url TEXT PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._connection.execute("CREATE INDEX IF NOT EXISTS profiles_accessed_at ON profiles (accessed_at)")
+        # Expired profiles are never served again, they only grow the file
+        purged: int = self.purge_expired()
+        if purged:
+            self.logger.debug(f"Purged {purged} expired profiles from the cache.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def get(self, url: str) -> Optional[Profile]:
+        """
+        Get a fresh cached profile.
+        :param url: The profile URL.
+        :return: The cached profile, or None if it is not cached or it is older than the TTL.
+        """
+        key: str = normalize_profile_url(url)
+        now: float = time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT profile FROM profiles WHERE url = ? AND fetched_at >= ?", (key, now - self.ttl)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE profiles SET accessed_at = ? WHERE url = ?", (now, key))
+        data = json.loads(row[0])
+        # Dates are normalized again, so the tenure of current positions is up to date
+        return Profile(data["name"], [Experience.from_dates(**experience) for experience in data["experiences"]])
+
+    def put(self, url: str, profile: Profile) -> None:
+        """Cache a profile, evicting the least recently used profiles when the cache is full."""
+        key: str = normalize_profile_url(url)
+        now: float = time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO profiles (url, profile, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(_serialize(profile)), now, now))
+            if self.max_entries is not None:
+                evicted = self._connection.execute(
+                    "DELETE FROM profiles WHERE url IN "
+                    "(SELECT url FROM profiles ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)).rowcount
+                if evicted:
+                    self.logger.debug(f"Evicted {evicted} profiles from the cache.")
+
+    def purge_expired(self) -> int:
+        """
+        Remove the profiles older than the TTL.
+        :return: The number of removed profiles.
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM profiles WHERE fetched_at < ?", (time() - self.ttl,)).rowcount
@@ -0,0 +1,569 @@
+import logging
+import math
+import os
+
+from contextlib import contextmanager
+from typing import List, Tuple, Optional, Any, Iterator, Callable
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from selenium.common import NoSuchElementException, TimeoutException, WebDriverException
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.wait import WebDriverWait
+
+from . import DEFAULT_BASE_URL
+from .profile_link import ProfileLink
+from .experience import Experience
+from .profile import Profile
+from .selectors import SEARCH_RESULT_CLASS, SEARCH_RESULT_SELECTORS, SEARCH_RESULTS_SCRIPT, PROFILE_NAME_CLASS, \
+    PROFILE_LOCATION_SELECTOR, EXPERIENCE_ENTITIES_SELECTOR, MULTIPLE_EXPERIENCE_SELECTOR, MULTIPLE_COMPANY_SELECTOR, \
+    MULTIPLE_POSITIONS_SELECTOR, MULTIPLE_POSITION_SELECTOR, MULTIPLE_DURATION_SELECTOR, SINGLE_COMPANY_SELECTOR, \
+    SINGLE_POSITION_SELECTOR, SINGLE_DURATION_SELECTOR, SEARCH_PAGINATION_SCRIPT, SEARCH_RESULTS_COUNT_SELECTOR, \
+    SEARCH_PAGINATION_PAGE_SELECTOR, RESULTS_PER_PAGE, MAX_SEARCH_PAGES, EXPERIENCE_SECTION_XPATH, \
+    SHOW_ALL_EXPERIENCES_SELECTOR, EXPERIENCE_DETAILS_PATH, EXPERIENCE_DETAILS_ENTITIES_SELECTOR
+from .browser import create_driver, block_urls
+from .cache import ProfileCache
+from .session import SessionStore, AUTH_COOKIE
+from .waits import PageWaiter
+from . import extractor
+from ..metrics import Metrics
+
+
+class LinkedIn:
+    def __init__(self, username: str, password: str, sleep_time: float = 5, timeout: int = 10,
+                 script_extraction: bool = True, page_source_extraction: bool = True,
+                 snapshot_dir: Optional[str] = None, cache: Optional[ProfileCache] = None,
+                 session_store: Optional[SessionStore] = None, browser_profile_dir: Optional[str] = None,
+                 lean: bool = False, prefetch: bool = True, metrics: Optional[Metrics] = None,
+                 base_url: str = DEFAULT_BASE_URL, full_experience: bool = False):
+        self.logger: logging.Logger = logging.getLogger(__name__)
+
+        self.username = username
+        self.password = password
+        self.sleep_time = sleep_time
+        self.timeout = timeout
+        self.script_extraction = script_extraction
+        self.page_source_extraction = page_source_extraction
+        self.snapshot_dir = snapshot_dir
+        self.cache = cache
+        self.session_store = session_store
+        self.prefetch = prefetch
+        self.lean = lean
+        # Load the experience details page of the profiles whose experience section is truncated
+        self.full_experience = full_experience
+        # Where the login form is, overridden to run against a stand-in site
+        self.base_url = base_url
+        self.metrics = metrics if metrics is not None else Metrics()
+
+        self.driver = create_driver(profile_dir=browser_profile_dir, lean=lean)
+        self._commands = self.metrics.instrument(self.driver)
+        self.driver.implicitly_wait(timeout)
+        self.waiter = PageWaiter(self.driver, sleep_time, metrics=self.metrics)
+        self._no_wait_depth = 0
+        # Whether the session comes from the session store and has not been checked against LinkedIn yet
+        self._session_restored = False
+
+    def __enter__(self):
+        if self.session_store is None or not self._restore_session():
+            self._login()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.logger.info(f"Page wait times: {self.waiter.stats.summary()}")
+        if self.session_store is not None and not self._session_restored:
+            # Keep the cookies LinkedIn refreshed during the session
+            try:
+                self.session_store.save(self.driver.get_cookies())
+            except WebDriverException as e:
+                self.logger.warning(f"Could not store the session: {e}")
+        # Closing the window would leave the driver process running, and the browser too with other tabs open
+        self.driver.quit()
+
+    def _login(self) -> None:
+        """Log in through the login form."""
+        self.logger.info("Logging in...")
+        self.driver.get(f"{self.base_url}/login")
+        self.driver.find_element(By.ID, "username").send_keys(self.username)
+        self.driver.find_element(By.ID, "password").send_keys(self.password)
+        self.driver.find_element(By.ID, "password").send_keys(Keys.ENTER)
+
+        if self.session_store is not None:
+            try:
+                WebDriverWait(self.driver, self.timeout).until(lambda driver: driver.get_cookie(AUTH_COOKIE))
+                self.session_store.save(self.driver.get_cookies())
+            except TimeoutException:
+                self.logger.warning("Login did not complete in time, not storing the session.")
+
+    def _restore_session(self) -> bool:
+        """
+        Restore the cookies of a stored session, without loading any page.
+        :return: Whether there was a valid stored session.
+        """
+        cookies: Optional[List[dict]] = self.session_store.load()
+        if cookies is None:
+            return False
+        self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [
+            {
+                "name": cookie["name"],
+                "value": cookie["value"],
+                "domain": cookie["domain"],
+                "path": cookie.get("path", "/"),
+                "secure": cookie.get("secure", False),
+                "httpOnly": cookie.get("httpOnly", False),
+                **({"sameSite": cookie["sameSite"]} if "sameSite" in cookie else {}),
+                **({"expires": cookie["expiry"]} if "expiry" in cookie else {}),
+            } for cookie in cookies
+        ]})
+        self.logger.info("Restored stored session.")
+        self._session_restored = True
+        return True
+
+    def _get(self, url: str) -> None:
+        """Load a page, logging in again if the restored session turns out to be no longer valid."""
+        self.driver.get(url)
+        if not self._session_restored:
+            return
+        self._session_restored = False
+        if any(path in self.driver.current_url for path in ("/login", "/authwall", "/checkpoint", "/uas/")):
+            self.logger.info("Stored session is no longer valid.")
+            self.session_store.clear()
+            self._login()
+            self.driver.get(url)
+
+    def search(self, search_url: str, start_page: int = 1) -> List[ProfileLink]:
+        """
+        Search for profiles in a LinkedIn search URL.
+        :param search_url: The search URL.
+        :param start_page: The results page to start from, to resume an interrupted search.
+        :return: The profile links found from the start page on.
+        """
+        profiles: List[ProfileLink] = []
+        for _, page_profiles in self.iter_search(search_url, start_page):
+            profiles.extend(page_profiles)
+        return profiles
+
+    def iter_search(self, search_url: str, start_page: int = 1,
+                    on_pagination: Optional[Callable[[int, int], None]] = None
+                    ) -> Iterator[Tuple[int, List[ProfileLink]]]:
+        """
+        Search for profiles in a LinkedIn search URL, yielding the profile links of each results page as soon as it is
+        extracted. Results pages are loaded by URL up to the last page, computed from the results count of the first
+        page loaded. With prefetch, the next page loads in a background tab while the current one is being processed,
+        so profiles can be visited in the search tab while the search is suspended.
+        :param search_url: The search URL.
+        :param start_page: The results page to start from, to resume an interrupted search.
+        :param on_pagination: Called with the last results page and the number of results of the search, once they
+        have been read. The search may stop before the last page, at the first empty page.
+        :return: Iterator over the page numbers and their profile links.
+        """
+        self.logger.info(f"Searching for profiles in {search_url} from page {start_page}...")
+
+        with self.metrics.stage("search_page_load"):
+            self._get(self._page_url(search_url, start_page))
+            self.waiter.wait_for_search_results()
+        last_page, results_count = self._read_pagination()
+        self.logger.info(f"Search has {results_count} results in {last_page} pages.")
+        if on_pagination is not None:
+            on_pagination(last_page, results_count)
+
+        search_tab: str = self.driver.current_window_handle
+        prefetch_tab: Optional[str] = None
+        page: int = start_page
+        try:
+            while True:
+                with self.metrics.stage("search_extraction"):
+                    page_profiles: List[ProfileLink] = self._extract_search_results()
+                self.metrics.increment("search_pages")
+                for profile_link_ in page_profiles:
+                    self.logger.info(f"Found profile: {profile_link_}")
+                more_pages: bool = page < last_page and len(page_profiles) > 0
+                if more_pages and self.prefetch:
+                    prefetch_tab = self._prefetch(self._page_url(search_url, page + 1), search_tab)
+
+                yield page, page_profiles
+
+                if not more_pages:
+                    logging.debug("No more pages found.")
+                    break
+                page += 1
+                with self.metrics.stage("search_page_load"):
+                    if prefetch_tab is not None:
+                        self.driver.close()
+                        self.driver.switch_to.window(prefetch_tab)
+                        search_tab, prefetch_tab = prefetch_tab, None
+                    else:
+                        self._get(self._page_url(search_url, page))
+                    self.waiter.wait_for_search_results()
+        finally:
+            if prefetch_tab is not None:
+                self._close_tab(prefetch_tab, search_tab)
+
+    def _read_pagination(self) -> Tuple[int, int]:
+        """
+        Read the number of results pages of the current search.
+        :return: The last results page and the number of results that can be visited. When they can not be read, the
+        last page LinkedIn ever shows and its results.
+        """
+        pagination: dict = self.driver.execute_script(SEARCH_PAGINATION_SCRIPT, SEARCH_RESULTS_COUNT_SELECTOR,
+                                                      SEARCH_PAGINATION_PAGE_SELECTOR)
+        max_results: int = MAX_SEARCH_PAGES * RESULTS_PER_PAGE
+        if pagination["total"] is not None:
+            last_page: int = min(max(math.ceil(pagination["total"] / RESULTS_PER_PAGE), 1), MAX_SEARCH_PAGES)
+            if pagination["lastPage"]:
+                last_page = min(pagination["lastPage"], MAX_SEARCH_PAGES)
+            return last_page, min(pagination["total"], max_results)
+        if pagination["lastPage"]:
+            last_page = min(pagination["lastPage"], MAX_SEARCH_PAGES)
+            return last_page, last_page * RESULTS_PER_PAGE
+        self.logger.warning("Could not read the search results count, searching until an empty page.")
+        return MAX_SEARCH_PAGES, max_results
+
+    def _prefetch(self, url: str, search_tab: str) -> str:
+        """
+        Start loading a page in a new background tab, without waiting for it.
+        :return: The handle of the new tab.
+        """
+        self.logger.debug(f"Prefetching {url}...")
+        self.driver.switch_to.new_window("tab")
+        tab: str = self.driver.current_window_handle
+        if self.lean:
+            # Resource blocking is set up per tab
+            block_urls(self.driver)
+        self.driver.execute_script("window.location.href = arguments[0];", url)
+        self.driver.switch_to.window(search_tab)
+        return tab
+
+    def _close_tab(self, tab: str, back_to: str) -> None:
+        try:
+            self.driver.switch_to.window(tab)
+            self.driver.close()
+            self.driver.switch_to.window(back_to)
+        except WebDriverException as e:
+            self.logger.debug(f"Could not close tab: {e}")
+
+    @staticmethod
+    def _page_url(search_url: str, page: int) -> str:
+        """Build the URL of a given results page of a search."""
+        parts = urlsplit(search_url)
+        # Searches keep their empty parameters, like keywords=
+        query: List[Tuple[str, str]] = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                                        if key != "page"]
+        query.append(("page", str(page)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _extract_search_results(self) -> List[ProfileLink]:
+        """
+        Extract the profile links of the current search results page.
+        :return: The profile links found in the page.
+        """
+        if self.page_source_extraction:
+            profile_links: List[ProfileLink] = extractor.parse_search_results(self.driver.page_source)
+            if profile_links:
+                return profile_links
+            # Either the page is empty or its markup is not the one the extractor knows, the driver tells which
+            self.logger.debug("No search results in the page source, looking them up in the page.")
+        if self.script_extraction:
+            return self._extract_search_results_by_script()
+        return self._extract_search_results_by_elements()
+
+    def _extract_search_results_by_script(self) -> List[ProfileLink]:
+        """Extract every result card of the page in a single driver command."""
+        results: List[dict] = self.driver.execute_script(SEARCH_RESULTS_SCRIPT, SEARCH_RESULT_SELECTORS) or []
+        profile_links: List[ProfileLink] = []
+        for result in results:
+            if not result["url"]:
+                self.logger.debug(f"Skipping search result without profile URL: {result}")
+                continue
+            profile_links.append(ProfileLink(
+                result["name"] if result["name"] is not None else "LinkedIn Member",
+                result["position"] if result["position"] is not None else "Unknown",
+                result["location"] if result["location"] is not None else "Unknown",
+                result["url"]
+            ))
+        return profile_links
+
+    def _extract_search_results_by_elements(self) -> List[ProfileLink]:
+        """Extract the result cards of the page looking up each field with its own driver command."""
+        profile_links: List[ProfileLink] = []
+        # The page is ready, so missing fields are missing for good: look them up without implicit waits
+        with self._without_implicit_wait():
+            results: list[WebElement] = self.driver.find_elements(
+                By.CLASS_NAME, SEARCH_RESULT_CLASS)
+            for entity in results:
+                try:
+                    name: str = entity.find_element(By.CSS_SELECTOR, SEARCH_RESULT_SELECTORS["name"]).text
+                except NoSuchElementException:
+                    name = "LinkedIn Member"
+
+                try:
+                    position: str = entity.find_element(
+                        By.CSS_SELECTOR, SEARCH_RESULT_SELECTORS["position"]).text.strip()
+                except NoSuchElementException:
+                    position = "Unknown"
+
+                try:
+                    location: str = entity.find_element(
+                        By.CSS_SELECTOR, SEARCH_RESULT_SELECTORS["location"]).text.strip()
+                except NoSuchElementException:
+                    location = "Unknown"
+
+                url: str = entity.find_element(
+                    By.CSS_SELECTOR, SEARCH_RESULT_SELECTORS["url"]).get_attribute("href")
+
+                profile_links.append(ProfileLink(
+                    name,
+                    position,
+                    location,
+                    url
+                ))
+        return profile_links
+
+    def get_profile(self, profile_link_: ProfileLink, refresh: bool = False) -> Optional[Profile]:
+        """
+        Get a profile from a profile link, from the cache if it was scraped recently.
+        :param refresh: Visit the profile even if it is cached, such as when its headline changed since, and cache it
+        again.
+        """
+        if self.cache is not None and not refresh:
+            cached: Optional[Profile] = self.cache.get(profile_link_.url)
+            if cached is not None:
+                self.logger.info(f"Got cached profile: {profile_link_}")
+                self.metrics.increment("profile_cache_hits")
+                return cached
+
+        profile: Profile = self._visit_profile(profile_link_)
+        if self.cache is not None:
+            self.cache.put(profile_link_.url, profile)
+        return profile
+
+    def _visit_profile(self, profile_link_: ProfileLink) -> Profile:
+        """Visit a profile page and parse it."""
+        self.logger.info(f"Getting profile: {profile_link_}...")
+        commands: int = self._commands.count
+
+        # Visit the profile page
+        with self.metrics.stage("profile_load"):
+            self._get(profile_link_.url)
+            self.waiter.wait_for_profile()
+
+        with self.metrics.stage("profile_extraction"):
+            profile: Profile = self._extract_profile(profile_link_)
+        self.metrics.increment("profiles_visited")
+        self.metrics.observe("driver_commands_per_profile", self._commands.count - commands)
+        return profile
+
+    def _extract_profile(self, profile_link_: ProfileLink) -> Profile:
+        """Parse the loaded profile page."""
+        if self.page_source_extraction or self.snapshot_dir is not None:
+            page_source: str = self.driver.page_source
+            self._save_snapshot(profile_link_, page_source)
+            if self.page_source_extraction:
+                page: extractor.ProfilePage = extractor.parse_profile_page(page_source, profile_link_)
+                if page.experience_section:
+                    if self.full_experience and page.more_experiences:
+                        return Profile(page.profile.name, self._get_experience_details(profile_link_, page.location))
+                    return page.profile
+                # Either the profile has no experiences or its markup is not the one the extractor knows
+                self.logger.debug(f"No experience section in the page source of {profile_link_.url}, looking it up "
+                                  f"in the page.")
+                self.metrics.increment("page_source_fallbacks")
+
+        # The page is ready, so missing elements are missing for good: parse it without implicit waits
+        with self._without_implicit_wait():
+            name: Optional[str] = self._extract_name_from_profile_page()
+            name = name if name is not None else profile_link_.name
+            location: str = self._extract_location_from_profile_page()
+
+            # Get the experience section
+            with self.metrics.stage("experience_section"):
+                experience_section = self._get_experience_section()
+            if self.full_experience and self._get_element_without_waiting_by(
+                    experience_section, By.CSS_SELECTOR, SHOW_ALL_EXPERIENCES_SELECTOR) is not None:
+                experiences = self._get_experience_details(profile_link_, location)
+            else:
+                experiences = self._get_experiences(experience_section, location)
+        return Profile(name, experiences)
+
+    def _get_experience_details(self, profile_link_: ProfileLink, location: str) -> List[Experience]:
+        """
+        Get every experience of a profile from its experience details page, for profiles whose experience section
+        does not list all of them.
+        """
+        self.logger.info(f"Getting every experience of profile: {profile_link_}...")
+        with self.metrics.stage("experience_details_load"):
+            self._get(self._experience_details_url(profile_link_.url))
+            self.waiter.wait_for_experience_details()
+        self.metrics.increment("experience_details_visited")
+
+        if self.page_source_extraction:
+            experiences: List[Experience] = extractor.parse_experience_details(self.driver.page_source, location)
+            if experiences:
+                return experiences
+            self.metrics.increment("page_source_fallbacks")
+        with self._without_implicit_wait():
+            entities: List[WebElement] = self._get_elements_without_waiting_by(
+                self.driver, By.CSS_SELECTOR, EXPERIENCE_DETAILS_ENTITIES_SELECTOR)
+            return self._get_experiences_from_entities(entities, location)
+
+    @staticmethod
+    def _experience_details_url(profile_url: str) -> str:
+        """Build the URL of the experience details page of a profile."""
+        parts = urlsplit(profile_url)
+        return urlunsplit(parts._replace(path=f"{parts.path.rstrip('/')}/{EXPERIENCE_DETAILS_PATH}", query=""))
+
+    @contextmanager
+    def _without_implicit_wait(self) -> Iterator[None]:
+        """
+        Disable the implicit wait of the driver for a whole page or section parse, restoring it once at the end.
+        Nested uses do not send any driver command.
+        """
+        self._no_wait_depth += 1
+        try:
+            if self._no_wait_depth == 1:
+                self.logger.debug("Disabling implicit wait...")
+                self.driver.implicitly_wait(0)
+            yield
+        finally:
+            self._no_wait_depth -= 1
+            if self._no_wait_depth == 0:
+                self.driver.implicitly_wait(self.timeout)
+                self.logger.debug("Implicit wait restored.")
+
+    def _save_snapshot(self, profile_link_: ProfileLink, page_source: str) -> None:
+        """Save the page source of a profile so it can be parsed again offline."""
+        if self.snapshot_dir is None:
+            return
+        slug: str = profile_link_.url.split("?")[0].rstrip("/").split("/")[-1]
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        with open(os.path.join(self.snapshot_dir, f"{slug}.html"), "w", encoding="utf-8") as f:
+            f.write(page_source)
+
+    def _get_element_without_waiting_by(self, element: Any, by: By, value: str) -> Optional[WebElement]:
+        if element is None:
+            return None
+        with self._without_implicit_wait():
+            try:
+                return element.find_element(by, value)
+            except NoSuchElementException:
+                return None
+
+    def _get_elements_without_waiting_by(self, element: Any, by: By, value: str) -> List[WebElement]:
+        if element is None:
+            return []
+        with self._without_implicit_wait():
+            try:
+                return element.find_elements(by, value)
+            except NoSuchElementException:
+                return []
+
+    def _extract_name_from_profile_page(self) -> Optional[str]:
+        """
+        Extract the name from the profile page.
+        :return: The name of the profile.
+        """
+        possible_name: Optional[WebElement] = self._get_element_without_waiting_by(
+            self.driver, By.CLASS_NAME, PROFILE_NAME_CLASS)
+        return possible_name.text if possible_name is not None else "Unknown"
+
+    def _extract_location_from_profile_page(self) -> str:
+        """
+        Extract the location from the profile page.
+        :return: The location of the profile.
+        """
+        possible_location: Optional[WebElement] = self._get_element_without_waiting_by(
+            self.driver, By.CSS_SELECTOR, PROFILE_LOCATION_SELECTOR)
+        return possible_location.text.strip() if possible_location is not None else "Unknown"
+
+    def _get_experience_section(self) -> Optional[WebElement]:
+        """
+        Get the experience section from the profile page, the one holding the experience anchor.
+        :return: The experience section.
+        """
+        section: Optional[WebElement] = self._get_element_without_waiting_by(
+            self.driver, By.XPATH, EXPERIENCE_SECTION_XPATH)
+        if section is not None:
+            return section
+
+        # Pages without the anchor: look for the section by its title, transferring the text of every section
+        self.logger.debug("Profile has no experience anchor, looking for the section by its title.")
+        for section in self._get_elements_without_waiting_by(self.driver, By.TAG_NAME, "section"):
+            if section.text.startswith("Experience\nExperience\n"):
+                return section
+        return None
+
+    def _get_experiences(self, section: WebElement, location: str) -> List[Experience]:
+        """
+        Get the experiences from a section.
+        :param section: The section to get the experiences from.
+        :return: A list of experiences.
+        """
+        return self._get_experiences_from_entities(self._get_experience_entities(section), location)
+
+    def _get_experiences_from_entities(self, entities: List[WebElement], location: str) -> List[Experience]:
+        """Get the experiences from experience entities, of the experience section or the experience details page."""
+        experiences: List[Experience] = []
+        for item in entities:
+            if self._is_multiple_experience(item):
+                experiences.extend(self._get_experience_with_multiple_positions(item, location))
+            else:
+                experience_ = self._get_experience(item, location)
+                if experience_ is not None:
+                    experiences.append(experience_)
+        return experiences
+
+    def _get_experience_entities(self, section: WebElement) -> List[WebElement]:
+        """Get the experience entities from a section."""
+        entities = self._get_elements_without_waiting_by(
+            section, By.CSS_SELECTOR, EXPERIENCE_ENTITIES_SELECTOR)
+        return entities if entities is not None else []
+
+    def _get_experience_with_multiple_positions(self, element: WebElement, location: str) -> List[Experience]:
+        """Get the experiences from a section with multiple positions."""
+        experiences: List[Experience] = []
+        company_element: Optional[WebElement] = self._get_element_without_waiting_by(
+            element, By.CSS_SELECTOR, MULTIPLE_COMPANY_SELECTOR)
+        company: str = company_element.text.strip() if company_element is not None else "Unknown"
+
+        item: WebElement
+        items: List[WebElement] = self._get_elements_without_waiting_by(
+            element, By.CSS_SELECTOR, MULTIPLE_POSITIONS_SELECTOR)
+        for item in items:
+            # Get the position
+            position_element: Optional[WebElement] = self._get_element_without_waiting_by(
+                item, By.CSS_SELECTOR, MULTIPLE_POSITION_SELECTOR)
+            position: str = position_element.text.strip() if position_element is not None else "Unknown"
+
+            # Get the duration
+            duration_element: Optional[WebElement] = self._get_element_without_waiting_by(
+                item, By.CSS_SELECTOR, MULTIPLE_DURATION_SELECTOR)
+            duration: Optional[str] = duration_element.text.strip() if duration_element is not None else None
+            experiences.append(Experience.from_duration(company, position, duration, location))
+        return experiences
+
+    def _get_experience(self, element: WebElement, location: str) -> Optional[Experience]:
+        """Get the experience from a section with a single position."""
+        # Get the company
+        company_element: Optional[WebElement] = self._get_element_without_waiting_by(
+            element, By.CSS_SELECTOR, SINGLE_COMPANY_SELECTOR)
+        try:
+            company: str = company_element.text.split("·")[0].strip() if company_element is not None else "Unknown"
+        except IndexError:
+            company = "Unknown"
+
+        # Get the position
+        position_element: Optional[WebElement] = self._get_element_without_waiting_by(
+            element, By.CSS_SELECTOR, SINGLE_POSITION_SELECTOR)
+        position: str = position_element.text.strip() if position_element is not None else "Unknown"
+
+        # Get the duration
+        duration_element: Optional[WebElement] = self._get_element_without_waiting_by(
+            element, By.CSS_SELECTOR, SINGLE_DURATION_SELECTOR)
+        duration: Optional[str] = duration_element.text.strip() if duration_element is not None else None
+        return Experience.from_duration(company, position, duration, location)
+
+    def _is_multiple_experience(self, element: WebElement) -> bool:
+        """Check if the experience has multiple positions."""
+        found = self._get_element_without_waiting_by(
+            element, By.CSS_SELECTOR, MULTIPLE_EXPERIENCE_SELECTOR)
+        return found is not None
@@ -0,0 +1,163 @@
+"""
+Normalization of the durations of LinkedIn experiences, like 'Jan 2020 - Present · 3 yrs', into typed dates and a
+tenure in months.
+
+The same durations repeat across the profiles of a company, so parsing is memoized on the raw strings. Rows of a
+finished job can be normalized in batch too, see `veget.normalize`.
+"""
+import csv
+import re
+import unicodedata
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+UNKNOWN = "Unknown"
+
+# Month names and abbreviations in the languages LinkedIn is commonly used in, without accents
+MONTHS: Dict[str, int] = {}
+for _number, _names in enumerate((
+        "jan january ene enero janv janvier januar jaen janeiro gen gennaio januari",
+        "feb february febrero fev fevr fevrier februar fevereiro febbraio februari",
+        "mar march marzo mars maerz marz marco mrt maart",
+        "apr april abr abril avr avril aprile",
+        "may mayo mai maio mag maggio mei",
+        "jun june junio juin juni junho giu giugno",
+        "jul july julio juil juillet juli julho lug luglio",
+        "aug august ago agosto aout augustus",
+        "sep sept september septiembre set septembre setembro settembre",
+        "oct october octubre okt oktober out outubro ott ottobre",
+        "nov november noviembre novembre novembro",
+        "dec december dic diciembre dez dezember dezembro dicembre",
+), start=1):
+    for _name in _names.split():
+        MONTHS[_name] = _number
+
+# Words meaning the position is current
+PRESENT = {"present", "now", "today", "actualidad", "actual", "presente", "hoy", "aujourd'hui", "aujourdhui",
+           "heute", "heden", "nu", "momento", "atual", "oggi", "attuale", "current"}
+
+# Hyphens only separate the dates when spaced or right after a year, en and em dashes always do
+_DATE_RANGE_SEPARATOR = re.compile(r"\s+-\s+|\s*[–—]\s*|(?<=\d)\s*-\s*")
+_YEAR = re.compile(r"\b(\d{4})\b")
+_WORD = re.compile(r"[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+@dataclass(frozen=True)
+class Tenure:
+    """Typed start and end of an experience. Dates without month are the January of their year."""
+    start: Optional[date]
+    end: Optional[date]
+    # The experience lasts until today, end is None
+    current: bool
+    months: Optional[int]
+
+
+UNKNOWN_TENURE = Tenure(None, None, False, None)
+
+
+def _fold(text: str) -> str:
+    """Lowercase text without accents, so localized month names match however they are written."""
+    return "".join(character for character in unicodedata.normalize("NFKD", text.casefold().replace("’", "'"))
+                   if not unicodedata.combining(character))
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str) -> Tuple[Optional[date], bool]:
+    """
+    Parse a date of a duration, like 'Jan 2020', 'ene. de 2020', '2020' or 'Present'.
+    :return: The date and whether its month is known. For current dates, None and True; for unreadable ones, None
+    and False.
+    """
+    folded: str = _fold(text.strip())
+    if folded in PRESENT or (not _YEAR.search(folded) and any(word in PRESENT for word in _WORD.findall(folded))):
+        return None, True
+    year = _YEAR.search(folded)
+    if year is None:
+        return None, False
+    month: Optional[int] = next((MONTHS[word] for word in _WORD.findall(folded) if word in MONTHS), None)
+    return date(int(year.group(1)), month or 1, 1), month is not None
+
+
+def split_duration(duration: str) -> Tuple[str, str]:
+    """Split a duration like 'Jan 2020 - Present · 3 yrs' into its start and end texts."""
+    dates: str = duration.split("·")[0].strip()
+    parts = _DATE_RANGE_SEPARATOR.split(dates, maxsplit=1)
+    if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+        # A single date is a position of less than a month
+        return (dates, dates) if _YEAR.search(dates) else (UNKNOWN, UNKNOWN)
+    return parts[0].strip(), parts[1].strip()
+
+
+def normalize_dates(start_text: str, end_text: str, today: Optional[date] = None) -> Tenure:
+    """
+    Normalize the start and end texts of an experience.
+    :param today: Date current experiences last until, today by default.
+    """
+    return _normalize_dates(start_text, end_text, today or date.today())
+
+
+@lru_cache(maxsize=65536)
+def _normalize_dates(start_text: str, end_text: str, today: date) -> Tenure:
+    start, start_month_known = parse_date(start_text)
+    end, end_month_known = parse_date(end_text)
+    current: bool = end is None and end_month_known
+    if start is None:
+        return Tenure(None, None if current else end, current, None)
+    last: date = today.replace(day=1) if current else end
+    if last is None or last < start:
+        return Tenure(start, end, current, None)
+    months: int = (last.year - start.year) * 12 + last.month - start.month
+    # LinkedIn counts both the first and the last month, but years without month only by their difference
+    if start_month_known and end_month_known:
+        months += 1
+    return Tenure(start, end, current, months)
+
+
+def normalize_duration(duration: Optional[str], today: Optional[date] = None) -> Tenure:
+    """
+    Normalize a duration like 'Jan 2020 - Present · 3 yrs'.
+    :param today: Date current experiences last until, today by default.
+    """
+    if duration is None:
+        return UNKNOWN_TENURE
+    return normalize_dates(*split_duration(duration), today=today)
+
+
+def normalize_rows(rows: Iterable[Dict[str, str]], start_field: str = "Start Date", end_field: str = "End Date",
+                   today: Optional[date] = None) -> Iterator[Dict[str, str]]:
+    """
+    Add the normalized dates and tenure of each row, as 'Start', 'End' (empty for current positions) and
+    'Tenure Months' fields.
+    :param rows: Rows of a job output, like the ones of csv.DictReader.
+    """
+    for row in rows:
+        tenure: Tenure = normalize_dates(row.get(start_field) or UNKNOWN, row.get(end_field) or UNKNOWN, today)
+        yield {
+            **row,
+            "Start": tenure.start.isoformat() if tenure.start is not None else "",
+            "End": tenure.end.isoformat() if tenure.end is not None else "",
+            "Tenure Months": str(tenure.months) if tenure.months is not None else "",
+        }
+
+
+def normalize_csv(input_path: str, output_path: str, today: Optional[date] = None) -> int:
+    """
+    Normalize the dates of a CSV written by a job into a new CSV. The normalized columns the CSV already has are
+    filled again.
+    :return: The number of rows written.
+    """
+    count: int = 0
+    with open(input_path, newline="", encoding="utf-8") as input_file, \
+            open(output_path, "w", newline="", encoding="utf-8") as output_file:
+        reader = csv.DictReader(input_file)
+        fields: List[str] = list(reader.fieldnames or [])
+        writer = csv.DictWriter(output_file, [*fields, *(field for field in ("Start", "End", "Tenure Months")
+                                                         if field not in fields)])
+        writer.writeheader()
+        for row in normalize_rows(reader, today=today):
+            writer.writerow(row)
+            count += 1
+    return count
@@ -1,10 +1,39 @@
+import sys
+
 from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from .dates import normalize_dates, split_duration, UNKNOWN
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Experience:
     company: str
     position: str
     start_date: str
     end_date: str
     location: str
+    # Normalized from start_date and end_date: end is None for current positions
+    start: Optional[date] = None
+    end: Optional[date] = None
+    current: bool = False
+    tenure_months: Optional[int] = None
+
+    def __post_init__(self):
+        # Company names, dates and locations repeat across the profiles of a company, keep a single copy of each
+        for field in ("company", "position", "start_date", "end_date", "location"):
+            object.__setattr__(self, field, sys.intern(getattr(self, field)))
+
+    @classmethod
+    def from_dates(cls, company: str, position: str, start_date: str, end_date: str, location: str) -> "Experience":
+        """Build an experience normalizing its start and end texts."""
+        tenure = normalize_dates(start_date, end_date)
+        return cls(company, position, start_date, end_date, location, tenure.start, tenure.end, tenure.current,
+                   tenure.months)
+
+    @classmethod
+    def from_duration(cls, company: str, position: str, duration: Optional[str], location: str) -> "Experience":
+        """Build an experience from a duration like 'Jan 2020 - Present · 3 yrs'."""
+        start_date, end_date = split_duration(duration) if duration is not None else (UNKNOWN, UNKNOWN)
+        return cls.from_dates(company, position, start_date, end_date, location)
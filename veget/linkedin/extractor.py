@@ -0,0 +1,183 @@
+"""
+Driver independent extraction of LinkedIn pages.
+
+Parses a single `driver.page_source` snapshot in-process, using the same selectors as the WebDriver based scraper, so
+saved pages can be parsed again offline.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from lxml.html import HtmlElement
+
+from .experience import Experience
+from .profile import Profile
+from .profile_link import ProfileLink
+from .selectors import SEARCH_RESULT_CLASS, SEARCH_RESULT_SELECTORS, PROFILE_NAME_CLASS, PROFILE_LOCATION_SELECTOR, \
+    EXPERIENCE_ENTITIES_SELECTOR, MULTIPLE_EXPERIENCE_SELECTOR, MULTIPLE_COMPANY_SELECTOR, MULTIPLE_POSITIONS_SELECTOR, \
+    MULTIPLE_POSITION_SELECTOR, MULTIPLE_DURATION_SELECTOR, SINGLE_COMPANY_SELECTOR, SINGLE_POSITION_SELECTOR, \
+    SINGLE_DURATION_SELECTOR, EXPERIENCE_SECTION_XPATH, SHOW_ALL_EXPERIENCES_SELECTOR, \
+    EXPERIENCE_DETAILS_ENTITIES_SELECTOR
+
+
+def _compile(selector: str) -> CSSSelector:
+    return CSSSelector(selector, translator="html")
+
+
+_SEARCH_RESULTS = _compile(f".{SEARCH_RESULT_CLASS}")
+_SEARCH_RESULT_NAME = _compile(SEARCH_RESULT_SELECTORS["name"])
+_SEARCH_RESULT_POSITION = _compile(SEARCH_RESULT_SELECTORS["position"])
+_SEARCH_RESULT_LOCATION = _compile(SEARCH_RESULT_SELECTORS["location"])
+_SEARCH_RESULT_URL = _compile(SEARCH_RESULT_SELECTORS["url"])
+_PROFILE_NAME = _compile(f".{PROFILE_NAME_CLASS}")
+_PROFILE_LOCATION = _compile(PROFILE_LOCATION_SELECTOR)
+_EXPERIENCE_ENTITIES = _compile(EXPERIENCE_ENTITIES_SELECTOR)
+_MULTIPLE_EXPERIENCE = _compile(MULTIPLE_EXPERIENCE_SELECTOR)
+_MULTIPLE_COMPANY = _compile(MULTIPLE_COMPANY_SELECTOR)
+_MULTIPLE_POSITIONS = _compile(MULTIPLE_POSITIONS_SELECTOR)
+_MULTIPLE_POSITION = _compile(MULTIPLE_POSITION_SELECTOR)
+_MULTIPLE_DURATION = _compile(MULTIPLE_DURATION_SELECTOR)
+_SINGLE_COMPANY = _compile(SINGLE_COMPANY_SELECTOR)
+_SINGLE_POSITION = _compile(SINGLE_POSITION_SELECTOR)
+_SINGLE_DURATION = _compile(SINGLE_DURATION_SELECTOR)
+_SHOW_ALL_EXPERIENCES = _compile(SHOW_ALL_EXPERIENCES_SELECTOR)
+_EXPERIENCE_DETAILS_ENTITIES = _compile(EXPERIENCE_DETAILS_ENTITIES_SELECTOR)
+
+
+@dataclass
+class ProfilePage:
+    """What a profile page tells, besides the profile itself."""
+    profile: Profile
+    location: str
+    # The experience section does not list every experience, the details page does
+    more_experiences: bool
+    # The page has an experience section, the profile has no experiences otherwise
+    experience_section: bool = True
+
+
+def parse_search_results(page_source: str) -> List[ProfileLink]:
+    """
+    Parse the profile links of a search results page.
+    :param page_source: The HTML of the search results page.
+    :return: The profile links found in the page.
+    """
+    document: HtmlElement = lxml_html.document_fromstring(page_source)
+    profile_links: List[ProfileLink] = []
+    for card in _SEARCH_RESULTS(document):
+        link: Optional[HtmlElement] = _first(_SEARCH_RESULT_URL, card)
+        if link is None or not link.get("href"):
+            continue
+        name: Optional[str] = _text_of(_SEARCH_RESULT_NAME, card)
+        profile_links.append(ProfileLink(
+            name if name else "LinkedIn Member",
+            _text_of(_SEARCH_RESULT_POSITION, card) or "Unknown",
+            _text_of(_SEARCH_RESULT_LOCATION, card) or "Unknown",
+            link.get("href")
+        ))
+    return profile_links
+
+
+def parse_profile(page_source: str, profile_link_: ProfileLink) -> Profile:
+    """
+    Parse a profile page.
+    :param page_source: The HTML of the profile page.
+    :param profile_link_: The link the profile page was visited from.
+    :return: The parsed profile.
+    """
+    return parse_profile_page(page_source, profile_link_).profile
+
+
+def parse_profile_page(page_source: str, profile_link_: ProfileLink) -> ProfilePage:
+    """
+    Parse a profile page, telling whether its experience section lists every experience.
+    :param page_source: The HTML of the profile page.
+    :param profile_link_: The link the profile page was visited from.
+    :return: The parsed profile page.
+    """
+    document: HtmlElement = lxml_html.document_fromstring(page_source)
+    name: str = _text_of(_PROFILE_NAME, document) or profile_link_.name
+    location: str = _text_of(_PROFILE_LOCATION, document) or "Unknown"
+    section: Optional[HtmlElement] = find_experience_section(document)
+    if section is None:
+        return ProfilePage(Profile(name, []), location, False, experience_section=False)
+    return ProfilePage(Profile(name, parse_experiences(section, location)), location,
+                       _first(_SHOW_ALL_EXPERIENCES, section) is not None)
+
+
+def parse_experience_details(page_source: str, location: str) -> List[Experience]:
+    """
+    Parse the experiences of an experience details page.
+    :param page_source: The HTML of the experience details page.
+    :param location: The location of the profile, used for every experience.
+    :return: A list of experiences.
+    """
+    document: HtmlElement = lxml_html.document_fromstring(page_source)
+    return _parse_entities(_EXPERIENCE_DETAILS_ENTITIES(document), location)
+
+
+def find_experience_section(document: HtmlElement) -> Optional[HtmlElement]:
+    """
+    Find the experience section of a profile page.
+    :return: The experience section, if the profile has one.
+    """
+    anchors: List[HtmlElement] = document.xpath(EXPERIENCE_SECTION_XPATH)
+    if anchors:
+        return anchors[0]
+    for section in document.iter("section"):
+        if section.text_content().split()[:2] == ["Experience", "Experience"]:
+            return section
+    return None
+
+
+def parse_experiences(section: HtmlElement, location: str) -> List[Experience]:
+    """
+    Parse the experiences of an experience section.
+    :param section: The section to get the experiences from.
+    :param location: The location of the profile, used for every experience.
+    :return: A list of experiences.
+    """
+    return _parse_entities(_EXPERIENCE_ENTITIES(section), location)
+
+
+def _parse_entities(entities: List[HtmlElement], location: str) -> List[Experience]:
+    experiences: List[Experience] = []
+    for entity in entities:
+        if _first(_MULTIPLE_EXPERIENCE, entity) is not None:
+            experiences.extend(_parse_experience_with_multiple_positions(entity, location))
+        else:
+            experiences.append(_parse_experience(entity, location))
+    return experiences
+
+
+def _parse_experience_with_multiple_positions(entity: HtmlElement, location: str) -> List[Experience]:
+    company: str = _text_of(_MULTIPLE_COMPANY, entity) or "Unknown"
+    experiences: List[Experience] = []
+    for item in _MULTIPLE_POSITIONS(entity):
+        if item is entity:
+            continue
+        position: str = _text_of(_MULTIPLE_POSITION, item) or "Unknown"
+        duration: Optional[str] = _text_of(_MULTIPLE_DURATION, item)
+        experiences.append(Experience.from_duration(company, position, duration, location))
+    return experiences
+
+
+def _parse_experience(entity: HtmlElement, location: str) -> Experience:
+    company_text: Optional[str] = _text_of(_SINGLE_COMPANY, entity)
+    company: str = company_text.split("·")[0].strip() if company_text is not None else "Unknown"
+    position: str = _text_of(_SINGLE_POSITION, entity) or "Unknown"
+    duration: Optional[str] = _text_of(_SINGLE_DURATION, entity)
+    return Experience.from_duration(company, position, duration, location)
+
+
+def _first(selector: CSSSelector, element: HtmlElement) -> Optional[HtmlElement]:
+    # CSSSelector also matches the context element itself, which querySelector never does
+    for found in selector(element):
+        if found is not element:
+            return found
+    return None
+
+
+def _text_of(selector: CSSSelector, element: HtmlElement) -> Optional[str]:
+    found: Optional[HtmlElement] = _first(selector, element)
+    return " ".join(found.text_content().split()) if found is not None else None
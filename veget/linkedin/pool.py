@@ -0,0 +1,190 @@
+"""Pool of logged in LinkedIn sessions visiting profiles concurrently."""
+import logging
+import queue
+import threading
+
+from collections import deque
+from concurrent.futures import Future
+from time import monotonic
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, Tuple
+
+from selenium.common import WebDriverException
+
+from .client import LinkedIn
+from .profile import Profile
+from .profile_link import ProfileLink
+
+
+class LinkedInPool:
+    """
+    Spreads profile visits across N LinkedIn sessions, each one owned by its own worker thread and logged in once.
+
+    A worker checks the health of its session before a task when it has not done so for a while, and replaces a
+    session that is unhealthy or fails with a WebDriver error, retrying the task on the new session.
+    """
+
+    def __init__(self, factory: Callable[[], LinkedIn], size: int, max_retries: int = 1,
+                 health_check_interval: float = 30):
+        """
+        :param factory: Creates a new, not logged in yet, session.
+        :param size: Number of concurrent sessions.
+        :param max_retries: Times a profile is retried on a new session after a WebDriver error.
+        :param health_check_interval: Seconds between health checks of an idle session.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.factory = factory
+        self.size = size
+        self.max_retries = max_retries
+        self.health_check_interval = health_check_interval
+
+        self._tasks: queue.Queue = queue.Queue()
+        self._workers: List[threading.Thread] = []
+
+    def __enter__(self):
+        for index in range(self.size):
+            worker = threading.Thread(target=self._work, args=(index,), name=f"linkedin-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for _ in self._workers:
+            self._tasks.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
+
+    def submit(self, profile_link_: ProfileLink, refresh: bool = False) -> Future:
+        """
+        Schedule a profile visit.
+        :param refresh: Visit the profile even if it is cached.
+        :return: Future of the visited profile.
+        """
+        future: Future = Future()
+        self._tasks.put((profile_link_, refresh, future))
+        return future
+
+    def map_profiles(self, profile_links: Iterable[ProfileLink],
+                     resolve: Optional[Callable[[ProfileLink], Optional[Profile]]] = None,
+                     refresh: Optional[Callable[[ProfileLink], bool]] = None
+                     ) -> Iterator[Tuple[ProfileLink, Optional[Profile]]]:
+        """
+        Visit profiles across the sessions of the pool, consuming the profile links lazily.
+        :param resolve: Gets the profile of a profile link without visiting it, when possible.
+        :param refresh: Whether a profile link needs a visit even if its profile is cached.
+        :return: Iterator over the profile links and their profiles, in the same order as the profile links. Profiles
+        that still fail with a WebDriver error after their retries are None.
+        """
+        pending: Deque[Tuple[ProfileLink, Future]] = deque()
+        try:
+            for profile_link_ in profile_links:
+                profile: Optional[Profile] = resolve(profile_link_) if resolve is not None else None
+                if profile is not None:
+                    future: Future = Future()
+                    future.set_result(profile)
+                else:
+                    future = self.submit(profile_link_, refresh is not None and refresh(profile_link_))
+                pending.append((profile_link_, future))
+                # Keep every session busy while bounding how far ahead of the consumer the pool goes
+                if len(pending) >= 2 * self.size:
+                    profile_link_, future = pending.popleft()
+                    yield profile_link_, self._result(profile_link_, future)
+            while pending:
+                profile_link_, future = pending.popleft()
+                yield profile_link_, self._result(profile_link_, future)
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _result(self, profile_link_: ProfileLink, future: Future) -> Optional[Profile]:
+        """The profile of a visit, or None if it failed with a WebDriver error on every session it was tried on."""
+        try:
+            return future.result()
+        except WebDriverException as e:
+            self.logger.error(f"Skipping {profile_link_.url} after {self.max_retries + 1} failed attempts: {e}")
+            return None
+
+    def _work(self, index: int) -> None:
+        li: Optional[LinkedIn] = None
+        last_check: float = monotonic()
+        try:
+            while True:
+                task: Optional[Tuple[ProfileLink, bool, Future]] = self._tasks.get()
+                if task is None:
+                    break
+                profile_link_, refresh, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                attempts: int = 0
+                while True:
+                    try:
+                        if li is not None and monotonic() - last_check > self.health_check_interval:
+                            if not self._is_healthy(li):
+                                self.logger.warning(f"Session {index} is not healthy, replacing it.")
+                                self._close(li)
+                                li = None
+                            last_check = monotonic()
+                        if li is None:
+                            li = self._open(index)
+                            last_check = monotonic()
+                        future.set_result(li.get_profile(profile_link_, refresh=refresh))
+                        break
+                    except WebDriverException as e:
+                        attempts += 1
+                        self.logger.warning(f"Session {index} failed getting {profile_link_.url}, replacing it: {e}")
+                        self._close(li)
+                        li = None
+                        if attempts > self.max_retries:
+                            future.set_exception(e)
+                            break
+                    except Exception as e:
+                        future.set_exception(e)
+                        break
+        finally:
+            self._close(li)
+
+    def _open(self, index: int) -> LinkedIn:
+        self.logger.info(f"Starting session {index}...")
+        li: LinkedIn = self.factory()
+        try:
+            return li.__enter__()
+        except Exception:
+            self._close(li)
+            raise
+
+    @staticmethod
+    def _is_healthy(li: LinkedIn) -> bool:
+        try:
+            return li.driver.execute_script("return 1;") == 1
+        except WebDriverException:
+            return False
+
+    def _close(self, li: Optional[LinkedIn]) -> None:
+        if li is None:
+            return
+        try:
+            li.__exit__(None, None, None)
+        except WebDriverException as e:
+            self.logger.debug(f"Error closing session: {e}")
+
+
+def visit_profiles(li: LinkedIn, pool: Optional[LinkedInPool], profile_links: Iterable[ProfileLink],
+                   resolve: Optional[Callable[[ProfileLink], Optional[Profile]]] = None,
+                   refresh: Optional[Callable[[ProfileLink], bool]] = None
+                   ) -> Iterator[Tuple[ProfileLink, Optional[Profile]]]:
+    """
+    Visit profiles across the sessions of a pool, or one after the other on the given session when there is no pool.
+    :param resolve: Gets the profile of a profile link without visiting it, when possible.
+    :param refresh: Whether a profile link needs a visit even if its profile is cached.
+    :return: Iterator over the profile links and their profiles, in the same order as the profile links. With a pool,
+    the profiles that failed on every session tried are None, see `LinkedInPool.map_profiles`.
+    """
+    if pool is not None:
+        yield from pool.map_profiles(profile_links, resolve, refresh)
+        return
+    for profile_link_ in profile_links:
+        profile: Optional[Profile] = resolve(profile_link_) if resolve is not None else None
+        if profile is None:
+            profile = li.get_profile(profile_link_, refresh=refresh is not None and refresh(profile_link_))
+        yield profile_link_, profile
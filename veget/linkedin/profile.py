@@ -1,10 +1,13 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Tuple
 
 from .experience import Experience
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Profile:
     name: str
-    experiences: List[Experience]
+    experiences: Tuple[Experience, ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "experiences", tuple(self.experiences))
@@ -1,9 +1,16 @@
+import sys
+
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProfileLink:
     name: str
     position: str
     location: str
     url: str
+
+    def __post_init__(self):
+        # Headlines and locations repeat across the results of a search, keep a single copy of each
+        object.__setattr__(self, "position", sys.intern(self.position))
+        object.__setattr__(self, "location", sys.intern(self.location))
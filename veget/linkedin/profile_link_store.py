@@ -0,0 +1,97 @@
+"""Column-backed storage of profile links, for searches with hundreds of thousands of results."""
+from array import array
+from typing import Dict, Iterable, Iterator, List, overload, Sequence, Union
+
+from .profile_link import ProfileLink
+
+
+class _TextColumn:
+    """Strings that are rarely repeated, such as names and URLs, as UTF-8 in a single buffer."""
+
+    def __init__(self):
+        self._data = bytearray()
+        self._ends = array("Q")
+
+    def append(self, value: str) -> None:
+        self._data += value.encode("utf-8")
+        self._ends.append(len(self._data))
+
+    def __getitem__(self, index: int) -> str:
+        start: int = self._ends[index - 1] if index else 0
+        return self._data[start:self._ends[index]].decode("utf-8")
+
+    def nbytes(self) -> int:
+        return len(self._data) + self._ends.itemsize * len(self._ends)
+
+
+class _CategoryColumn:
+    """Strings repeated across rows, such as headlines and locations, as codes into their distinct values."""
+
+    def __init__(self):
+        self._values: List[str] = []
+        self._codes_by_value: Dict[str, int] = {}
+        self._codes = array("I")
+
+    def append(self, value: str) -> None:
+        code: int = self._codes_by_value.setdefault(value, len(self._values))
+        if code == len(self._values):
+            self._values.append(value)
+        self._codes.append(code)
+
+    def __getitem__(self, index: int) -> str:
+        return self._values[self._codes[index]]
+
+    def nbytes(self) -> int:
+        return sum(len(value.encode("utf-8")) for value in self._values) + self._codes.itemsize * len(self._codes)
+
+
+class ProfileLinkStore(Sequence[ProfileLink]):
+    """
+    Append-only sequence of profile links kept column by column instead of as one object per link. Links are built
+    again when read, so it trades some CPU for memory on very large searches.
+    """
+
+    def __init__(self, profile_links: Iterable[ProfileLink] = ()):
+        self._names = _TextColumn()
+        self._positions = _CategoryColumn()
+        self._locations = _CategoryColumn()
+        self._urls = _TextColumn()
+        self._length: int = 0
+        self.extend(profile_links)
+
+    def append(self, profile_link_: ProfileLink) -> None:
+        self._names.append(profile_link_.name)
+        self._positions.append(profile_link_.position)
+        self._locations.append(profile_link_.location)
+        self._urls.append(profile_link_.url)
+        self._length += 1
+
+    def extend(self, profile_links: Iterable[ProfileLink]) -> None:
+        for profile_link_ in profile_links:
+            self.append(profile_link_)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index: int) -> ProfileLink: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[ProfileLink]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ProfileLink, List[ProfileLink]]:
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("profile link index out of range")
+        return ProfileLink(self._names[index], self._positions[index], self._locations[index], self._urls[index])
+
+    def __iter__(self) -> Iterator[ProfileLink]:
+        for index in range(self._length):
+            yield self[index]
+
+    def nbytes(self) -> int:
+        """Approximate size of the stored data, without the fixed overhead of the containers."""
+        return sum(column.nbytes() for column in (self._names, self._positions, self._locations, self._urls))
@@ -0,0 +1,85 @@
+"""CSS selectors shared by the WebDriver based scraper and the page source extractor."""
+
+SEARCH_RESULT_CLASS = "entity-result__item"
+
+# Relative to each search result card
+SEARCH_RESULT_SELECTORS = {
+    "name": "div:nth-of-type(2) > div > div > div > span > span > a > span > span",
+    "position": "div:nth-of-type(2) > div > div:nth-of-type(2) > div",
+    "location": "div:nth-of-type(2) > div > div:nth-of-type(2) > div:nth-of-type(2)",
+    "url": "div:nth-of-type(2) > div > div > div > span > span > a",
+}
+
+# Collects every search result card of the page in one round-trip. Receives SEARCH_RESULT_SELECTORS as its argument
+# and returns a list of {name, position, location, url} objects, with null for the fields that were not found.
+SEARCH_RESULTS_SCRIPT = f"""
+const selectors = arguments[0];
+const text = (card, selector, strip) => {{
+    const element = card.querySelector(selector);
+    if (element === null) {{
+        return null;
+    }}
+    return strip ? element.innerText.trim() : element.innerText;
+}};
+return Array.from(document.getElementsByClassName("{SEARCH_RESULT_CLASS}")).map(card => {{
+    const link = card.querySelector(selectors.url);
+    return {{
+        name: text(card, selectors.name, false),
+        position: text(card, selectors.position, true),
+        location: text(card, selectors.location, true),
+        url: link !== null ? link.href : null
+    }};
+}});
+"""
+
+RESULTS_PER_PAGE = 10
+# LinkedIn never shows more results pages than this
+MAX_SEARCH_PAGES = 100
+
+SEARCH_RESULTS_COUNT_SELECTOR = ".search-results-container h2"
+SEARCH_PAGINATION_PAGE_SELECTOR = ".artdeco-pagination__indicator--number"
+
+# Reads the results count header and the last page of the pagination, when rendered. Receives
+# SEARCH_RESULTS_COUNT_SELECTOR and SEARCH_PAGINATION_PAGE_SELECTOR as its arguments and returns a {total, lastPage}
+# object, with null for the values that could not be read.
+SEARCH_PAGINATION_SCRIPT = """
+const number = element => {
+    if (element === null || element === undefined) {
+        return null;
+    }
+    const digits = element.innerText.replace(/\\D/g, "");
+    return digits.length > 0 ? parseInt(digits, 10) : null;
+};
+const pages = document.querySelectorAll(arguments[1]);
+return {
+    total: number(document.querySelector(arguments[0])),
+    lastPage: number(pages[pages.length - 1])
+};
+"""
+
+PROFILE_NAME_CLASS = "text-heading-xlarge"
+PROFILE_LOCATION_SELECTOR = "main > section > .ph5 > .mt2 > .mt2 > span"
+
+# The experience section is the one holding the #experience anchor
+EXPERIENCE_SECTION_XPATH = "//*[@id='experience']/ancestor::section[1]"
+
+# Relative to the experience section
+EXPERIENCE_ENTITIES_SELECTOR = "section > .pvs-list__outer-container > .pvs-list > li > .pvs-entity"
+# Link to the experience details page, only shown when the section does not list every experience
+SHOW_ALL_EXPERIENCES_SELECTOR = "a[href*='/details/experience']"
+
+# Experience details page, relative to the profile URL, listing every experience with the same markup as the section
+EXPERIENCE_DETAILS_PATH = "details/experience/"
+EXPERIENCE_DETAILS_ENTITIES_SELECTOR = ".scaffold-finite-scroll__content > .pvs-list > li > .pvs-entity"
+
+# Relative to an experience entity
+MULTIPLE_EXPERIENCE_SELECTOR = "div:nth-of-type(2) > div > .optional-action-target-wrapper"
+MULTIPLE_COMPANY_SELECTOR = "div:nth-of-type(2) > .display-flex > a > div .visually-hidden"
+MULTIPLE_POSITIONS_SELECTOR = ".pvs-entity"
+SINGLE_COMPANY_SELECTOR = "div:nth-of-type(2) > div > div > span .visually-hidden"
+SINGLE_POSITION_SELECTOR = "div:nth-of-type(2) > div > div > div > span > .visually-hidden"
+SINGLE_DURATION_SELECTOR = "div:nth-of-type(2) > div > div > span:nth-of-type(2) .visually-hidden"
+
+# Relative to each position of an experience with multiple positions
+MULTIPLE_POSITION_SELECTOR = "div:nth-of-type(2) > div > a > div > span .visually-hidden"
+MULTIPLE_DURATION_SELECTOR = "div:nth-of-type(2) > div > a > .t-black--light > .visually-hidden"
@@ -0,0 +1,88 @@
+"""Encrypted persistence of authenticated LinkedIn sessions."""
+import base64
+import json
+import logging
+import os
+import threading
+
+from time import time
+from typing import List, Optional
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+
+DEFAULT_SESSION_PATH = os.path.join(os.path.expanduser("~"), ".veget", "session.bin")
+
+# Cookie holding the LinkedIn authentication token
+AUTH_COOKIE = "li_at"
+
+_SALT_SIZE = 16
+_KDF_ITERATIONS = 390_000
+
+
+class SessionStore:
+    """
+    Cookie jar of a logged in session, encrypted with a key derived from the LinkedIn credentials, so only whoever
+    knows them can reuse it.
+    """
+
+    def __init__(self, path: str, username: str, password: str, min_validity: float = 60 * 60):
+        """
+        :param path: File the encrypted cookies are stored in.
+        :param min_validity: Seconds the authentication cookie must still be valid for to reuse the session.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.path = path
+        self.min_validity = min_validity
+        self._secret: bytes = f"{username}\0{password}".encode("utf-8")
+
+    def load(self) -> Optional[List[dict]]:
+        """
+        Load the stored cookies.
+        :return: The cookies, or None if there is no stored session, it can not be decrypted or it has expired.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                content: bytes = f.read()
+        except FileNotFoundError:
+            return None
+        salt, token = content[:_SALT_SIZE], content[_SALT_SIZE:]
+        try:
+            cookies: List[dict] = json.loads(self._fernet(salt).decrypt(token))
+        except (InvalidToken, ValueError):
+            self.logger.warning(f"Stored session {self.path} can not be read, ignoring it.")
+            return None
+
+        auth_cookie: Optional[dict] = next((cookie for cookie in cookies if cookie["name"] == AUTH_COOKIE), None)
+        if auth_cookie is None or auth_cookie.get("expiry", 0) < time() + self.min_validity:
+            self.logger.info("Stored session has expired.")
+            return None
+        return cookies
+
+    def save(self, cookies: List[dict]) -> None:
+        """Store the cookies of a logged in session."""
+        if not any(cookie["name"] == AUTH_COOKIE for cookie in cookies):
+            self.logger.debug("Not storing a session without authentication cookie.")
+            return
+        salt: bytes = os.urandom(_SALT_SIZE)
+        token: bytes = self._fernet(salt).encrypt(json.dumps(cookies).encode("utf-8"))
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Write and rename, so concurrent sessions never leave a half written file
+        temporary_path: str = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(salt + token)
+        os.replace(temporary_path, self.path)
+
+    def clear(self) -> None:
+        """Forget the stored session."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _fernet(self, salt: bytes) -> Fernet:
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=_KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self._secret)))
@@ -0,0 +1,147 @@
+"""Condition based waiting for LinkedIn pages."""
+import logging
+import statistics
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from selenium.common import JavascriptException, TimeoutException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support.wait import WebDriverWait
+
+from .selectors import SEARCH_RESULT_CLASS, PROFILE_NAME_CLASS, EXPERIENCE_DETAILS_ENTITIES_SELECTOR
+from ..metrics import Metrics
+
+
+SEARCH_RESULTS_READY_SCRIPT = f"""
+return document.readyState === "complete" && (
+    document.getElementsByClassName("{SEARCH_RESULT_CLASS}").length > 0 ||
+    document.querySelector(".search-reusable-search-no-results, .artdeco-empty-state") !== null
+);
+"""
+
+NETWORK_IDLE_SCRIPT = """
+const quietTime = arguments[0];
+const entries = performance.getEntriesByType("resource");
+const lastResponse = entries.reduce((last, entry) => Math.max(last, entry.responseEnd), 0);
+return document.readyState === "complete" && performance.now() - lastResponse >= quietTime;
+"""
+
+PROFILE_READY_SCRIPT = f"""
+return document.readyState === "complete" &&
+    document.getElementsByClassName("{PROFILE_NAME_CLASS}").length > 0 &&
+    document.getElementById("experience") !== null;
+"""
+
+EXPERIENCE_DETAILS_READY_SCRIPT = f"""
+return document.readyState === "complete" &&
+    document.querySelector("{EXPERIENCE_DETAILS_ENTITIES_SELECTOR}") !== null;
+"""
+
+
+def search_results_rendered(driver: WebDriver) -> bool:
+    """The search results list, or the empty results message, has been rendered."""
+    return driver.execute_script(SEARCH_RESULTS_READY_SCRIPT)
+
+
+def experience_section_present(driver: WebDriver) -> bool:
+    """The profile header and its experience section have been rendered."""
+    return driver.execute_script(PROFILE_READY_SCRIPT)
+
+
+def experience_details_rendered(driver: WebDriver) -> bool:
+    """The experience details page lists its first experiences."""
+    return driver.execute_script(EXPERIENCE_DETAILS_READY_SCRIPT)
+
+
+def network_idle(quiet_time: float = 0.5) -> Callable[[WebDriver], bool]:
+    """The page has loaded and no resource has finished loading during the last `quiet_time` seconds."""
+    def condition(driver: WebDriver) -> bool:
+        return driver.execute_script(NETWORK_IDLE_SCRIPT, quiet_time * 1000)
+    return condition
+
+
+def any_of(*conditions: Callable[[WebDriver], bool]) -> Callable[[WebDriver], bool]:
+    """Any of the given conditions holds."""
+    def condition(driver: WebDriver) -> bool:
+        return any(condition_(driver) for condition_ in conditions)
+    return condition
+
+
+@dataclass
+class WaitStats:
+    """Time actually spent waiting for each kind of page."""
+    durations: Dict[str, List[float]] = field(default_factory=dict)
+    timeouts: Dict[str, int] = field(default_factory=dict)
+
+    def record(self, name: str, duration: float, timed_out: bool) -> None:
+        self.durations.setdefault(name, []).append(duration)
+        if timed_out:
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded waits.
+        :return: Count, timeouts, mean, median, 90th percentile and maximum wait in seconds for each kind of page.
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for name, durations in self.durations.items():
+            summary[name] = {
+                "count": len(durations),
+                "timeouts": self.timeouts.get(name, 0),
+                "mean": statistics.fmean(durations),
+                "p50": statistics.median(durations),
+                "p90": statistics.quantiles(durations, n=10)[-1] if len(durations) > 1 else durations[0],
+                "max": max(durations),
+            }
+        return summary
+
+
+class PageWaiter:
+    """Waits until a page is usable, up to a per-page upper bound, recording how long each wait took."""
+
+    def __init__(self, driver: WebDriver, max_wait: float, poll_frequency: float = 0.1,
+                 metrics: Optional[Metrics] = None):
+        """
+        :param metrics: Where to also record the waits, as `wait_<name>` stages.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.driver = driver
+        self.max_wait = max_wait
+        self.poll_frequency = poll_frequency
+        self.metrics = metrics
+        self.stats = WaitStats()
+
+    def wait(self, name: str, condition: Callable[[WebDriver], bool]) -> bool:
+        """
+        Wait until a condition holds or the upper bound is reached.
+        :param name: Kind of page being waited for, used to group the recorded durations.
+        :param condition: Readiness condition of the page.
+        :return: Whether the condition was met before the upper bound.
+        """
+        start = perf_counter()
+        try:
+            WebDriverWait(self.driver, self.max_wait, poll_frequency=self.poll_frequency,
+                          ignored_exceptions=(JavascriptException,)).until(condition)
+            ready = True
+        except TimeoutException:
+            self.logger.warning(f"Page '{name}' not ready after {self.max_wait} seconds, going on.")
+            ready = False
+        duration = perf_counter() - start
+        self.stats.record(name, duration, not ready)
+        if self.metrics is not None:
+            self.metrics.record(f"wait_{name}", duration, start)
+            if not ready:
+                self.metrics.increment(f"wait_{name}_timeouts")
+        self.logger.debug(f"Waited {duration:.3f} seconds for '{name}'.")
+        return ready
+
+    def wait_for_search_results(self) -> bool:
+        return self.wait("search", search_results_rendered)
+
+    def wait_for_profile(self) -> bool:
+        return self.wait("profile", any_of(experience_section_present, network_idle()))
+
+    def wait_for_experience_details(self) -> bool:
+        return self.wait("experience_details", any_of(experience_details_rendered, network_idle()))
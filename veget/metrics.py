@@ -0,0 +1,183 @@
+"""Low overhead instrumentation of scraping jobs: stage timings, counters and optional traces."""
+import cProfile
+import json
+import logging
+import os
+import threading
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Histogram:
+    """
+    Distribution of values in exponential buckets, so recording is constant time and memory no matter how long the
+    job runs. Quantiles are approximated by the upper bound of their bucket.
+    """
+
+    def __init__(self, smallest: float = 0.001, buckets: int = 24):
+        """
+        :param smallest: Upper bound of the first bucket, each following bucket doubles it.
+        :param buckets: Number of buckets, bigger values go to an overflow bucket.
+        """
+        self.bounds: List[float] = [smallest * 2 ** index for index in range(buckets)]
+        self.counts: List[int] = [0] * (buckets + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float) -> None:
+        index: int = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank: float = q * self.count
+        seen: int = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "max": self.max,
+        }
+
+
+class CommandCounter:
+    """Number of WebDriver commands sent by one driver."""
+
+    def __init__(self):
+        self.count: int = 0
+
+
+class Metrics:
+    """
+    Thread safe registry of the stage timings and counters of a job. A single instance can be shared by every session
+    of the job.
+    """
+
+    def __init__(self, trace: bool = False, max_trace_events: int = 1_000_000):
+        """
+        :param trace: Also keep every stage as a Chrome trace event, see `dump_trace`.
+        :param max_trace_events: Trace events kept, later ones are dropped.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.trace = trace
+        self.max_trace_events = max_trace_events
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self._trace_events: List[dict] = []
+        self._lock = threading.Lock()
+        self._started: float = perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a stage of the job. Stages can be nested."""
+        start: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start, start)
+
+    def record(self, name: str, duration: float, start: Optional[float] = None) -> None:
+        """Record the duration in seconds of a stage."""
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            self.histograms[name].record(duration)
+            if self.trace and start is not None and len(self._trace_events) < self.max_trace_events:
+                self._trace_events.append({
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._started) * 1e6,
+                    "dur": duration * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                })
+
+    def observe(self, name: str, value: float) -> None:
+        """Record a value that is not a duration, such as a count per item."""
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = Histogram(smallest=1)
+            self.histograms[name].record(value)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def instrument(self, driver) -> CommandCounter:
+        """
+        Count the commands a WebDriver sends, both per command and in total.
+        :return: Counter of the commands sent by this driver only.
+        """
+        counter = CommandCounter()
+        execute = driver.execute
+
+        def counted_execute(driver_command: str, params: Optional[dict] = None):
+            counter.count += 1
+            self.increment(f"driver.{driver_command}")
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+        return counter
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "elapsed": perf_counter() - self._started,
+                "histograms": {name: histogram.summary() for name, histogram in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def dump(self, path: str) -> None:
+        """Write the summary of the metrics to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        self.logger.info(f"Metrics written to {path}")
+
+    def dump_trace(self, path: str) -> None:
+        """Write the traced stages to a JSON file that chrome://tracing or Perfetto can open."""
+        with self._lock:
+            events: List[dict] = list(self._trace_events)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        self.logger.info(f"Trace written to {path}")
+
+
+@contextmanager
+def profiled(path: Optional[str]) -> Iterator[None]:
+    """
+    Profile the calling thread with cProfile, writing the stats to a file `pstats` or snakeviz can read.
+    :param path: Stats file, or None to not profile.
+    """
+    if path is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        logging.getLogger(__name__).info(f"Profile written to {path}")
@@ -0,0 +1,15 @@
+import click
+
+from .linkedin.dates import normalize_csv
+
+
+@click.command()
+@click.argument('input_path', type=click.Path(exists=True, dir_okay=False))
+@click.argument('output_path', type=click.Path(dir_okay=False))
+def main(input_path, output_path):
+    """Add normalized start, end and tenure columns to a CSV written by a scraping job."""
+    click.echo(f"Normalized {normalize_csv(input_path, output_path)} rows")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""Progress of a scraping job, shared between the thread doing the work and whoever shows it."""
+import threading
+
+from dataclasses import dataclass
+from time import monotonic
+from typing import Dict, Optional, Tuple
+
+
+@dataclass
+class ProgressSnapshot:
+    """Consistent view of the progress of a job at a given moment."""
+    status: str
+    companies: int
+    companies_done: int
+    company: Optional[str]
+    # Companies being scraped, in the order they started, the last one being company
+    active_companies: Tuple[str, ...]
+    profiles: int
+    company_profiles: Dict[str, int]
+    expected_profiles: Dict[str, int]
+    elapsed: float
+    finished: bool
+
+    @property
+    def profiles_per_minute(self) -> float:
+        return self.profiles / self.elapsed * 60 if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> float:
+        """Estimated fraction of the job done, between 0 and 1."""
+        if self.finished or self.companies == 0:
+            return 1.0
+        company_fraction: float = sum(
+            min(self.company_profiles.get(company, 0) / self.expected_profiles[company], 0.99)
+            for company in self.active_companies if self.expected_profiles.get(company))
+        return (self.companies_done + company_fraction) / self.companies
+
+    @property
+    def eta(self) -> Optional[float]:
+        """
+        Estimated seconds left, from the current rate and the search results count of each company.
+        :return: The estimation, or None while there is no rate or results count to estimate from yet.
+        """
+        if self.finished:
+            return 0.0
+        if self.profiles == 0 or not self.expected_profiles:
+            return None
+        average_expected: float = sum(self.expected_profiles.values()) / len(self.expected_profiles)
+        companies_left: int = self.companies - self.companies_done - len(self.active_companies)
+        remaining: float = max(companies_left, 0) * average_expected
+        for company in self.active_companies:
+            remaining += max(self.expected_profiles.get(company, average_expected) -
+                             self.company_profiles.get(company, 0), 0)
+        return remaining / self.profiles_per_minute * 60
+
+
+class ScrapingProgress:
+    """
+    Thread safe progress of a scraping job. The worker updates it as often as it wants, and readers sample it at their
+    own rate, so updates are coalesced for free.
+    """
+
+    def __init__(self, companies: int = 0):
+        self._lock = threading.Lock()
+        self._started: float = monotonic()
+        self._finished_at: Optional[float] = None
+        self._status: str = "Starting scraping process"
+        self._companies: int = companies
+        self._companies_done: int = 0
+        # Companies being scraped, several of them when companies run concurrently
+        self._active: Dict[str, None] = {}
+        self._profiles: int = 0
+        self._company_profiles: Dict[str, int] = {}
+        self._expected_profiles: Dict[str, int] = {}
+
+    def start(self, companies: int) -> None:
+        with self._lock:
+            self._started = monotonic()
+            self._companies = companies
+
+    def set_status(self, status: str) -> None:
+        with self._lock:
+            self._status = status
+
+    def start_company(self, company: str) -> None:
+        with self._lock:
+            self._active[company] = None
+            self._company_profiles.setdefault(company, 0)
+            self._status = f"Scraping {company} profiles"
+
+    def expect_profiles(self, company: str, count: int) -> None:
+        """Set the number of profiles the search of a company is expected to find."""
+        with self._lock:
+            self._expected_profiles[company] = count
+
+    def profile_done(self, company: str, name: str) -> None:
+        with self._lock:
+            self._profiles += 1
+            self._company_profiles[company] = self._company_profiles.get(company, 0) + 1
+            self._status = f"Working on company {company}. " \
+                           f"Scraped profile #{self._company_profiles[company]} '{name}'"
+
+    def company_done(self, company: str, skipped: bool = False) -> None:
+        with self._lock:
+            self._companies_done += 1
+            self._active.pop(company, None)
+            if not skipped:
+                self._expected_profiles[company] = self._company_profiles.get(company, 0)
+
+    def finish(self) -> None:
+        with self._lock:
+            self._finished_at = monotonic()
+            self._status = "Scraping process finished"
+
+    def snapshot(self) -> ProgressSnapshot:
+        with self._lock:
+            return ProgressSnapshot(
+                status=self._status,
+                companies=self._companies,
+                companies_done=self._companies_done,
+                company=next(reversed(self._active), None),
+                active_companies=tuple(self._active),
+                profiles=self._profiles,
+                company_profiles=dict(self._company_profiles),
+                expected_profiles=dict(self._expected_profiles),
+                elapsed=(self._finished_at or monotonic()) - self._started,
+                finished=self._finished_at is not None,
+            )
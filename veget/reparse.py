@@ -0,0 +1,38 @@
+import os
+
+import click
+
+from .linkedin import DEFAULT_BASE_URL, ProfileLink
+from .linkedin.extractor import parse_profile_page
+from .sinks import open_sink, profile_rows
+
+
+@click.command()
+@click.argument('pages_dir', type=click.Path(exists=True, file_okay=False))
+@click.argument('output_path', type=click.Path(dir_okay=False))
+@click.option('--company', default=None,
+              help='Only write the experiences in this company, instead of every experience of the profiles')
+def main(pages_dir, output_path, company):
+    """Parse again the profile pages saved by a scraping job with --pages-dir, without a browser."""
+    count: int = 0
+    sink = open_sink(output_path)
+    try:
+        for file_name in sorted(os.listdir(pages_dir)):
+            slug, extension = os.path.splitext(file_name)
+            if extension != ".html":
+                continue
+            with open(os.path.join(pages_dir, file_name), encoding="utf-8") as f:
+                page_source: str = f.read()
+            # Pages are saved under the last path segment of the profile URL
+            url: str = f"{DEFAULT_BASE_URL}/in/{slug}/"
+            page = parse_profile_page(page_source, ProfileLink(slug, "Unknown", "Unknown", url))
+            sink.write(url, profile_rows(company, ProfileLink(page.profile.name, "Unknown", page.location, url),
+                                         page.profile))
+            count += 1
+    finally:
+        sink.close()
+    click.echo(f"Parsed {count} profile pages")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Batch scraping jobs over several companies, without any GUI, shared by the command line and the GUI scraping thread.
+
+A job file lists the companies to scrape, either as CSV with 'company', 'search_url' and optional 'aliases' columns:
+
+    company,search_url,aliases
+    Acme,https://www.linkedin.com/search/results/people/?currentCompany=%5B%221%22%5D,"Acme Robotics, ACME Labs"
+
+or as JSON:
+
+    {"companies": [{"name": "Acme", "search_url": "https://...", "aliases": ["Acme Robotics"]}]}
+"""
+import csv
+import json
+import logging
+import queue
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from .companies import CompanyIndex, parse_aliases
+from .journal import JobJournal, resume_search
+from .metrics import Metrics
+from .progress import ScrapingProgress
+from .sinks import BackgroundWriter, DEFAULT_CSV_FIELDS, DELTA_CSV_FIELDS, open_sink, profile_rows, removed_row
+from .snapshots import SnapshotDiff, SnapshotStore
+
+if TYPE_CHECKING:
+    from .linkedin.client import LinkedIn
+    from .linkedin.pool import LinkedInPool
+
+
+@dataclass(frozen=True)
+class JobCompany:
+    """A company of a job, with the search listing its employees."""
+    name: str
+    search_url: str
+    aliases: Tuple[str, ...] = ()
+
+
+def load_job_file(path: str) -> List[JobCompany]:
+    """
+    Read the companies of a job file, JSON if its extension is .json and CSV otherwise.
+    :raise ValueError: If a company has no name or search URL.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            entries: List[dict] = json.load(f)["companies"]
+        else:
+            entries = list(csv.DictReader(f))
+    companies: List[JobCompany] = []
+    for number, entry in enumerate(entries, start=1):
+        name: str = (entry.get("name") or entry.get("company") or "").strip()
+        search_url: str = (entry.get("search_url") or "").strip()
+        if not name or not search_url:
+            raise ValueError(f"Company #{number} of {path} needs a name and a search URL")
+        aliases = entry.get("aliases") or ()
+        companies.append(JobCompany(name, search_url,
+                                    parse_aliases(aliases) if isinstance(aliases, str) else tuple(aliases)))
+    return companies
+
+
+class JobRunner:
+    """
+    Scrapes the companies of a job into an output, checkpointing its progress to a journal.
+
+    Companies are spread over up to `concurrency` lanes. Each lane logs in its own searching session, plus a pool of
+    sessions visiting profiles when there are several sessions per company, and keeps them for every company it
+    scrapes. Every lane writes to the same output and journal.
+    """
+
+    def __init__(self, new_session: Callable[[], "LinkedIn"], companies: List[JobCompany], journal: JobJournal,
+                 output: Optional[str] = None, progress: Optional[ScrapingProgress] = None,
+                 metrics: Optional[Metrics] = None, sessions: int = 1, concurrency: int = 1,
+                 headline_only: bool = False, every_experience: bool = False,
+                 on_message: Optional[Callable[[str], None]] = None,
+                 new_search_session: Optional[Callable[[], "LinkedIn"]] = None,
+                 snapshots: Optional[SnapshotStore] = None):
+        """
+        :param new_session: Creates a new, not logged in yet, session.
+        :param companies: Companies to scrape. When resuming, the companies recorded in the journal are used instead.
+        :param journal: Journal of the job, resumed from if it comes from an unfinished run.
+        :param output: File to write the experiences to, or None to only scrape them.
+        :param progress: Progress of the job to update.
+        :param metrics: Metrics of the job, the sessions record theirs too.
+        :param sessions: Sessions visiting the profiles of each company.
+        :param concurrency: Most companies scraped at the same time.
+        :param headline_only: Do not visit the profiles whose search result headline already names the company.
+        :param every_experience: Write every experience of the profiles, not only the ones in the company.
+        :param on_message: Called with a message on each step of the job, from the lane doing it.
+        :param new_search_session: Creates the searching session of each lane, new_session by default.
+        :param snapshots: Search results of the previous job. With them, only the profiles that are new or whose
+        headline or location changed are visited, the profiles no longer found are written as removed, and the output
+        is appended to, so it accumulates the changes of each job.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.new_session = new_session
+        self.new_search_session = new_search_session if new_search_session is not None else new_session
+        self.companies: List[JobCompany] = companies
+        self.journal = journal
+        self.output = output
+        self.progress = progress if progress is not None else ScrapingProgress()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.sessions: int = sessions
+        self.concurrency: int = concurrency
+        self.headline_only: bool = headline_only
+        self.every_experience: bool = every_experience
+        self.on_message: Callable[[str], None] = on_message if on_message is not None else self.logger.info
+        self.snapshots = snapshots
+        self._index: CompanyIndex = CompanyIndex()
+        self._stop = threading.Event()
+
+    def run(self) -> None:
+        """Scrape every company not done yet, then discard the journal."""
+        resuming: bool = self.journal.resuming
+        if resuming:
+            aliases: Dict[str, Tuple[str, ...]] = {company.name: company.aliases for company in self.companies}
+            self.companies = [JobCompany(name, search_url, aliases.get(name, ()))
+                              for name, search_url in self.journal.company_search]
+            self.on_message("Resuming unfinished scraping process")
+        else:
+            self.journal.record_job([(company.name, company.search_url) for company in self.companies])
+        self.progress.start(len(self.companies))
+        self._index = CompanyIndex((company.name for company in self.companies),
+                                   {company.name: company.aliases for company in self.companies})
+
+        pending: queue.Queue = queue.Queue()
+        for company in self.companies:
+            if self.journal.company(company.name).done:
+                self.on_message(f"{company.name} profiles already scraped")
+                self.progress.company_done(company.name, skipped=True)
+            else:
+                pending.put(company)
+
+        lanes: int = min(self.concurrency, pending.qsize())
+        delta: bool = self.snapshots is not None
+        with BackgroundWriter(open_sink(self.output, append=resuming or delta,
+                                        csv_fields=DELTA_CSV_FIELDS if delta else DEFAULT_CSV_FIELDS),
+                              metrics=self.metrics) if self.output is not None else nullcontext() as writer:
+            if lanes == 1:
+                self._lane(pending, writer)
+            elif lanes > 1:
+                with ThreadPoolExecutor(lanes, thread_name_prefix="job-lane") as executor:
+                    futures: List[Future] = [executor.submit(self._lane, pending, writer) for _ in range(lanes)]
+                    for future in futures:
+                        future.result()
+
+        self.journal.discard()
+        self.progress.finish()
+        self.on_message("Scraping process finished")
+
+    def _lane(self, pending: queue.Queue, writer: Optional[BackgroundWriter]) -> None:
+        """Scrape companies one after the other on the same sessions, until there are none left."""
+        # Sessions need selenium, which is only imported once a job starts
+        from .linkedin.pool import LinkedInPool
+        # With several sessions, the searching one searches while the pool visits the profiles found
+        pool = LinkedInPool(self.new_session, self.sessions) if self.sessions > 1 else None
+        try:
+            with self.new_search_session() as li, pool if pool is not None else nullcontext():
+                while not self._stop.is_set():
+                    try:
+                        company: JobCompany = pending.get_nowait()
+                    except queue.Empty:
+                        return
+                    self._scrape_company(li, pool, company, writer)
+        except Exception:
+            # A failing lane stops the others once they finish their current company
+            self._stop.set()
+            raise
+
+    def _scrape_company(self, li: "LinkedIn", pool: Optional["LinkedInPool"], company: JobCompany,
+                        writer: Optional[BackgroundWriter]) -> None:
+        from .linkedin.pool import visit_profiles
+        name: str = company.name
+        progress = self.journal.company(name)
+        self.progress.start_company(name)
+        count: int = 0
+        # Without snapshots every profile found needs a visit
+        diff: Optional[SnapshotDiff] = self.snapshots.diff(name) if self.snapshots is not None else None
+        profile_links = (profile_link for profile_link in resume_search(
+            li, self.journal, name, company.search_url,
+            on_results_count=lambda results_count: self.progress.expect_profiles(
+                name, results_count - len(progress.done_profiles)))
+            if (diff is None or diff.needs_visit(profile_link)) and profile_link.url not in progress.done_profiles)
+        # Profiles whose headline already names the company do not need a visit
+        resolve = partial(self._index.headline_profile, name) if self.headline_only else None
+        # Cached profiles of the profiles changed since the previous job are outdated
+        refresh = diff.is_changed if diff is not None else None
+        for profile_link, profile in visit_profiles(li, pool, profile_links, resolve, refresh):
+            if profile is None:
+                # Logged by the pool, the company goes on without the rows of the profile
+                self.journal.record_profile_failed(name, profile_link.url)
+                self.metrics.increment("profiles_failed")
+                self.on_message(f"Could not get profile '{profile_link.name}', skipping it")
+                continue
+            count += 1
+            self.progress.profile_done(name, profile_link.name)
+            self.on_message(f"Profile '{profile}'")
+            # With an output, profiles are only done once their rows are flushed to it
+            if writer is not None:
+                rows = profile_rows(None if self.every_experience else name, profile_link, profile, self._index)
+                writer.write(profile_link.url, rows,
+                             on_flushed=partial(self.journal.record_profile, name, profile_link.url))
+            else:
+                self.journal.record_profile(name, profile_link.url)
+        if diff is not None:
+            self._report_diff(name, diff, writer)
+        if writer is not None:
+            writer.when_flushed(partial(self._company_done, name))
+        else:
+            self._company_done(name)
+        self.progress.company_done(name)
+        self.on_message(f"{name} profiles ({count}) scraped")
+
+    def _report_diff(self, name: str, diff: SnapshotDiff, writer: Optional[BackgroundWriter]) -> None:
+        """
+        Write the profiles no longer found by the search of a company as removed, once its search is done. The profiles
+        an incomplete search did not find may still be there, so none is written as removed then.
+        """
+        removed = diff.removed()
+        if removed and not self.journal.company(name).search_complete:
+            self.logger.warning(f"Search of {name} stopped before its last page or found far fewer profiles than its "
+                                f"results count, not writing {len(removed)} profiles it did not find as removed")
+            removed = []
+        if writer is not None:
+            for profile_link in removed:
+                writer.write(profile_link.url, [removed_row(None if self.every_experience else name, profile_link)])
+        for counter, value in (("added", diff.added), ("changed", diff.changed), ("unchanged", diff.unchanged),
+                               ("removed", len(removed))):
+            self.metrics.increment(f"profiles_{counter}", value)
+        self.on_message(f"{name}: {diff.added} new, {diff.changed} changed, {diff.unchanged} unchanged and "
+                        f"{len(removed)} removed profiles")
+
+    def _company_done(self, name: str) -> None:
+        """Checkpoint a company, and keep its search results for the next job, once its rows are in the output."""
+        if self.snapshots is not None:
+            progress = self.journal.company(name)
+            if progress.search_complete:
+                # Profiles that could not be visited are left out, so the next job visits them as new ones
+                self.snapshots.replace(name, (profile_link for profile_link in progress.profile_links
+                                              if profile_link.url not in progress.failed_profiles))
+            else:
+                self.logger.warning(f"Search of {name} is incomplete, keeping its previous snapshot")
+        self.journal.record_company_done(name)
@@ -0,0 +1,381 @@
+"""Output sinks for scraped rows, written by a background thread in batches."""
+import csv
+import dataclasses
+import json
+import logging
+import os
+import queue
+import shutil
+import sqlite3
+import threading
+
+from dataclasses import dataclass
+from datetime import date
+from time import monotonic
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from .companies import CompanyIndex
+from .linkedin import Profile, ProfileLink
+from .metrics import Metrics
+
+
+@dataclass
+class OutputRow:
+    company: str
+    employee_name: str
+    role: str
+    based_on: str
+    start_date: str
+    end_date: str
+    profile_url: str
+    # Normalized dates of the experience, see Experience
+    start: Optional[date] = None
+    end: Optional[date] = None
+    tenure_months: Optional[int] = None
+    # The profile left the company since the previous job, see removed_row
+    removed: bool = False
+
+
+FIELDS: Tuple[str, ...] = tuple(field.name for field in dataclasses.fields(OutputRow))
+
+HEADERS = {
+    "company": "Company",
+    "employee_name": "Employee Name",
+    "role": "Role",
+    "based_on": "Based On",
+    "start_date": "Start Date",
+    "end_date": "End Date",
+    "profile_url": "Profile URL",
+    "start": "Start",
+    "end": "End",
+    "tenure_months": "Tenure Months",
+    "removed": "Removed",
+}
+
+# Normalized date columns, which CSV files written before they existed lack
+NORMALIZED_CSV_FIELDS: Tuple[str, ...] = ("start", "end", "tenure_months")
+DEFAULT_CSV_FIELDS: Tuple[str, ...] = ("company", "employee_name", "role", "based_on", "start_date", "end_date",
+                                       *NORMALIZED_CSV_FIELDS)
+# Columns of the CSV files of incremental jobs, which need to tell which profile a removal is about
+DELTA_CSV_FIELDS: Tuple[str, ...] = (*DEFAULT_CSV_FIELDS, "profile_url", "removed")
+
+
+def profile_rows(company: Optional[str], profile_link: ProfileLink, profile: Profile,
+                 companies: Optional[CompanyIndex] = None) -> List[OutputRow]:
+    """
+    Build the output rows of a scraped profile: one per experience in the company, or a single one from the search
+    result if the profile has no experiences.
+    :param company: Company searched, or None to keep every experience with its own company.
+    :param companies: Companies of the job with their aliases, to match the experiences against. By default,
+    experiences match the company searched by normalized name.
+    """
+    if company is not None and companies is None:
+        companies = CompanyIndex([company])
+    if not profile.experiences:
+        return [OutputRow(company or "", profile_link.name, profile_link.position, profile_link.location, "Unknown",
+                          "Unknown", profile_link.url)]
+    return [
+        OutputRow(experience.company if company is None else company, profile_link.name, experience.position,
+                  experience.location, experience.start_date, experience.end_date, profile_link.url, experience.start,
+                  experience.end, experience.tenure_months)
+        for experience in profile.experiences
+        if company is None or companies.matches(company, experience.company)
+    ]
+
+
+def removed_row(company: Optional[str], profile_link: ProfileLink) -> OutputRow:
+    """
+    Build the row telling a profile is no longer found by the search of a company. Sinks that can replace the rows
+    of a profile delete them, the others write the row.
+    :param company: Company searched, or None if the rows of the profile kept every experience.
+    """
+    return OutputRow(company or "", profile_link.name, "", profile_link.location, "", "", profile_link.url,
+                     removed=True)
+
+
+def _plain(value):
+    """Value of a row as text formats and SQLite store it."""
+    return value.isoformat() if isinstance(value, date) else value
+
+
+class Sink:
+    """Destination of the rows of a job. Rows arrive grouped by profile, so sinks can replace a profile's rows."""
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class CsvSink(Sink):
+    def __init__(self, path: str, append: bool = False, fields: Sequence[str] = DEFAULT_CSV_FIELDS):
+        """
+        When appending to a file written without the normalized date columns, rows are written without them too.
+        :raise ValueError: If appending to a file whose header has other columns than the fields.
+        """
+        self.fields = tuple(fields)
+        header: List[str] = [HEADERS[field] for field in self.fields]
+        write_header: bool = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        if not write_header:
+            with open(path, newline="", encoding="utf-8") as f:
+                existing_header: List[str] = next(csv.reader(f), [])
+            legacy_fields = tuple(field for field in self.fields if field not in NORMALIZED_CSV_FIELDS)
+            if existing_header == [HEADERS[field] for field in legacy_fields]:
+                self.fields = legacy_fields
+                header = [HEADERS[field] for field in self.fields]
+            elif existing_header != header:
+                raise ValueError(f"Can not append to {path}, its columns {', '.join(existing_header)} are not "
+                                 f"{', '.join(header)}")
+        self._file = open(path, "a" if append else "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if write_header:
+            self._writer.writerow(header)
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        self._writer.writerows([_plain(getattr(row, field)) for field in self.fields] for row in rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlSink(Sink):
+    def __init__(self, path: str, append: bool = False):
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        self._file.writelines(json.dumps(dataclasses.asdict(row), ensure_ascii=False, default=_plain) + "\n"
+                              for row in rows)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+SQLITE_TYPES = {"tenure_months": "INTEGER", "removed": "INTEGER"}
+
+
+class ParquetSink(Sink):
+    """
+    Parquet file, needs pyarrow. Parquet files can not be appended to, so each flush writes its rows to a part file of
+    its own in a `.parts` directory next to the file, and closing merges the parts into the file. Flushed rows survive
+    a crash that way, and a resumed job merges the parts of the interrupted one too.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow, install veget with the 'parquet' extra")
+        self._pyarrow = pyarrow
+        types = {"start": pyarrow.date32(), "end": pyarrow.date32(), "tenure_months": pyarrow.int32(),
+                 "removed": pyarrow.bool_()}
+        self._schema = pyarrow.schema([(field, types.get(field, pyarrow.string())) for field in FIELDS])
+        self._path = path
+        self._append: bool = append
+        self._parts_path: str = f"{path}.parts"
+        if not append and os.path.isdir(self._parts_path):
+            # Left by an interrupted job that is not being resumed
+            shutil.rmtree(self._parts_path)
+        os.makedirs(self._parts_path, exist_ok=True)
+        self._parts: int = len(self._part_paths())
+        self._rows: List[OutputRow] = []
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        self._rows.extend(rows)
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        part_path: str = os.path.join(self._parts_path, f"{self._parts:06d}.parquet")
+        # Parts only show up complete, a crash while writing one leaves a temporary file behind
+        self._pyarrow.parquet.write_table(self._pyarrow.Table.from_pylist(
+            [dataclasses.asdict(row) for row in self._rows], schema=self._schema), f"{part_path}.tmp")
+        os.replace(f"{part_path}.tmp", part_path)
+        self._parts += 1
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        with self._pyarrow.parquet.ParquetWriter(f"{self._path}.tmp", self._schema) as writer:
+            if self._append and os.path.exists(self._path):
+                writer.write_table(self._conform(self._pyarrow.parquet.read_table(self._path)))
+            for part_path in self._part_paths():
+                writer.write_table(self._conform(self._pyarrow.parquet.read_table(part_path)))
+        os.replace(f"{self._path}.tmp", self._path)
+        shutil.rmtree(self._parts_path)
+
+    def _part_paths(self) -> List[str]:
+        return [os.path.join(self._parts_path, name) for name in sorted(os.listdir(self._parts_path))
+                if name.endswith(".parquet")]
+
+    def _conform(self, table):
+        """Cast a table to the schema, files written before some fields existed get them empty."""
+        for field in self._schema:
+            if field.name not in table.column_names:
+                table = table.append_column(field, self._pyarrow.nulls(len(table), field.type))
+        return table.select(FIELDS).cast(self._schema)
+
+
+class SqliteSink(Sink):
+    """
+    SQLite table of rows, where writing a profile again replaces its previous rows for the same company, and removed
+    rows delete them.
+    """
+
+    def __init__(self, path: str, append: bool = False, table: str = "profiles"):
+        self.table = table
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            if not append:
+                self._connection.execute(f"DROP TABLE IF EXISTS {table}")
+            columns: str = ", ".join(f"{field} {SQLITE_TYPES.get(field, 'TEXT')}" for field in FIELDS)
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+            # Tables written before some fields existed get them empty
+            existing = {row[1] for row in self._connection.execute(f"PRAGMA table_info({table})")}
+            for field in FIELDS:
+                if field not in existing:
+                    self._connection.execute(
+                        f"ALTER TABLE {table} ADD COLUMN {field} {SQLITE_TYPES.get(field, 'TEXT')}")
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_profile ON {table} (profile_url, company)")
+
+    def write(self, profile_url: str, rows: List[OutputRow]) -> None:
+        self._connection.executemany(
+            f"DELETE FROM {self.table} WHERE profile_url = ? AND company = ?",
+            {(profile_url, row.company) for row in rows if row.company})
+        # A removal without company is about every experience of the profile
+        if any(row.removed and not row.company for row in rows):
+            self._connection.execute(f"DELETE FROM {self.table} WHERE profile_url = ?", (profile_url,))
+        self._connection.executemany(
+            f"INSERT INTO {self.table} ({', '.join(FIELDS)}) VALUES ({', '.join('?' for _ in FIELDS)})",
+            [tuple(map(_plain, dataclasses.astuple(row))) for row in rows if not row.removed])
+
+    def flush(self) -> None:
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.commit()
+        self._connection.close()
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".ndjson": JsonlSink,
+    ".parquet": ParquetSink,
+    ".sqlite": SqliteSink,
+    ".db": SqliteSink,
+}
+
+
+def open_sink(path: str, append: bool = False, csv_fields: Sequence[str] = DEFAULT_CSV_FIELDS) -> Sink:
+    """
+    Open the sink matching the extension of a file.
+    :param append: Keep the rows already in the file.
+    :param csv_fields: Columns of a CSV file, other formats have every field.
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported output format '{extension}', use one of {', '.join(SINKS)}")
+    if SINKS[extension] is CsvSink:
+        return CsvSink(path, append=append, fields=csv_fields)
+    return SINKS[extension](path, append=append)
+
+
+class BackgroundWriter:
+    """
+    Writes rows to a sink from a background thread, flushing when enough rows are pending or enough time has passed,
+    whatever comes first.
+    """
+
+    def __init__(self, sink: Sink, flush_rows: int = 500, flush_interval: float = 1.0,
+                 metrics: Optional[Metrics] = None):
+        """
+        :param metrics: Where to record the `write` and `flush` stages and the `rows_written` counter.
+        """
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        self.sink = sink
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def write(self, profile_url: str, rows: List[OutputRow], on_flushed: Optional[Callable[[], None]] = None) -> None:
+        """
+        Queue the rows of a profile.
+        :param on_flushed: Called from the writer thread once the rows have been flushed to the sink.
+        """
+        self._raise_error()
+        self._queue.put((profile_url, rows, on_flushed))
+
+    def when_flushed(self, callback: Callable[[], None]) -> None:
+        """Call a function from the writer thread once every row queued so far has been flushed to the sink."""
+        self._raise_error()
+        self._queue.put((None, [], callback))
+
+    def close(self) -> None:
+        """Write the queued rows and close the sink."""
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Output writer failed") from self._error
+
+    def _run(self) -> None:
+        pending_rows: int = 0
+        pending_callbacks: List[Callable[[], None]] = []
+        last_flush: float = monotonic()
+        try:
+            while True:
+                timeout: float = max(self.flush_interval - (monotonic() - last_flush), 0)
+                try:
+                    item = self._queue.get(timeout=timeout if pending_rows or pending_callbacks else None)
+                except queue.Empty:
+                    item = ()
+                if item:
+                    profile_url, rows, on_flushed = item
+                    if profile_url is not None:
+                        with self.metrics.stage("write"):
+                            self.sink.write(profile_url, rows)
+                        self.metrics.increment("rows_written", len(rows))
+                    pending_rows += len(rows)
+                    if on_flushed is not None:
+                        pending_callbacks.append(on_flushed)
+                if item is None or pending_rows >= self.flush_rows or \
+                        monotonic() - last_flush >= self.flush_interval:
+                    with self.metrics.stage("flush"):
+                        self.sink.flush()
+                    for callback in pending_callbacks:
+                        callback()
+                    pending_rows, pending_callbacks, last_flush = 0, [], monotonic()
+                if item is None:
+                    break
+        except BaseException as e:
+            self.logger.exception("Output writer failed")
+            self._error = e
+        finally:
+            try:
+                self.sink.close()
+            except Exception:
+                self.logger.exception("Could not close the output")
@@ -0,0 +1,117 @@
+"""Snapshots of the search results of each company, so a job only visits the profiles changed since the last job."""
+import logging
+import os
+import sqlite3
+import threading
+
+from typing import Dict, Iterable, List, Optional, Set
+
+from .linkedin import ProfileLink
+from .linkedin.cache import normalize_profile_url
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.expanduser("~"), ".veget", "snapshots.sqlite")
+
+
+class SnapshotDiff:
+    """
+    Compares the profile links found by a search, as they arrive, against the snapshot of the previous search of the
+    same company.
+    """
+
+    def __init__(self, previous: Dict[str, ProfileLink]):
+        """
+        :param previous: Profile links of the previous search, keyed by normalized URL.
+        """
+        self.previous = previous
+        self.seen: Set[str] = set()
+        # Profiles whose headline or location changed, their cached profiles are outdated
+        self._changed: Set[str] = set()
+        self.added: int = 0
+        self.changed: int = 0
+        self.unchanged: int = 0
+
+    def needs_visit(self, profile_link_: ProfileLink) -> bool:
+        """
+        Record a profile link found by the search.
+        :return: Whether the profile is new, or its headline or location changed since the previous search.
+        """
+        key: str = normalize_profile_url(profile_link_.url)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        previous: Optional[ProfileLink] = self.previous.get(key)
+        if previous is None:
+            self.added += 1
+            return True
+        if previous.position != profile_link_.position or previous.location != profile_link_.location:
+            self.changed += 1
+            self._changed.add(key)
+            return True
+        self.unchanged += 1
+        return False
+
+    def is_changed(self, profile_link_: ProfileLink) -> bool:
+        """Whether needs_visit found the headline or location of a profile link changed since the previous search."""
+        return normalize_profile_url(profile_link_.url) in self._changed
+
+    def removed(self) -> List[ProfileLink]:
+        """Profile links of the previous search the current one has not found, once the search is done."""
+        return [profile_link_ for key, profile_link_ in self.previous.items() if key not in self.seen]
+
+
+class SnapshotStore:
+    """SQLite store of the profile links found by the last finished search of each company."""
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH):
+        self.logger: logging.Logger = logging.getLogger(__name__)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Snapshots are replaced from the output writer thread, once the rows of the company are flushed
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS profile_links (
+                    company TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    location TEXT NOT NULL,
+                    PRIMARY KEY (company, url)
+                )
+            """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def load(self, company: str) -> Dict[str, ProfileLink]:
+        """
+        Get the snapshot of a company.
+        :return: Its profile links keyed by normalized URL, empty if the company was never searched.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url, name, position, location FROM profile_links WHERE company = ?", (company,)).fetchall()
+        return {normalize_profile_url(url): ProfileLink(name, position, location, url)
+                for url, name, position, location in rows}
+
+    def diff(self, company: str) -> SnapshotDiff:
+        """Start comparing a new search of a company against its snapshot."""
+        return SnapshotDiff(self.load(company))
+
+    def replace(self, company: str, profile_links: Iterable[ProfileLink]) -> None:
+        """Replace the snapshot of a company with the profile links of its last search."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM profile_links WHERE company = ?", (company,))
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO profile_links (company, url, name, position, location) VALUES (?, ?, ?, ?, ?)",
+                [(company, profile_link_.url, profile_link_.name, profile_link_.position, profile_link_.location)
+                 for profile_link_ in profile_links])
+        self.logger.debug(f"Replaced the snapshot of {company}")
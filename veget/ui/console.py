@@ -1,4 +1,5 @@
 from collections import deque
+from itertools import groupby
 
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QPlainTextEdit
@@ -6,27 +7,54 @@ from PySide6.QtGui import QTextCursor, QColor, QTextCharFormat
 
 
 class Console(QPlainTextEdit):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, max_lines: int = 10000, max_queued: int = 50000):
+        """
+        :param max_lines: Scrollback, older lines are discarded.
+        :param max_queued: Messages waiting to be shown, older ones are dropped when more arrive.
+        """
         super().__init__(parent)
 
         self.setReadOnly(True)
         self.setStyleSheet("background-color: black; color: white; font-family: monospace; font-size: 12px;")
+        self.setMaximumBlockCount(max_lines)
         self.timer = QTimer(self)
         self.timer.setInterval(100)
         self.timer.timeout.connect(self._on_timeout)
         self.timer.start()
-        self.q = deque()
+        self.q = deque(maxlen=max_queued)
+        self.dropped = 0
+        self._formats: dict = {}
 
     def log(self, message, color=None):
+        if len(self.q) == self.q.maxlen:
+            self.dropped += 1
         self.q.append((message, color))
 
     def _on_timeout(self):
-        if len(self.q) > 0:
-            message, color = self.q.pop()
-            self.moveCursor(QTextCursor.End)
+        if not self.q:
+            return
+        messages = []
+        while self.q:
+            messages.append(self.q.popleft())
+        if self.dropped:
+            messages.insert(0, (f"... {self.dropped} messages dropped", "yellow"))
+            self.dropped = 0
+
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() == scroll_bar.maximum()
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for color, group in groupby(messages, key=lambda message: message[1]):
+            cursor.insertText("".join(message + '\n' for message, _ in group), self._format(color))
+        cursor.endEditBlock()
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def _format(self, color):
+        if color not in self._formats:
+            text_format = QTextCharFormat()
             if color is not None:
-                text_format = QTextCharFormat()
                 text_format.setForeground(QColor(color))
-                self.textCursor().setCharFormat(text_format)
-            self.insertPlainText(message + '\n')
-            self.moveCursor(QTextCursor.End)
+            self._formats[color] = text_format
+        return self._formats[color]
@@ -1,8 +1,12 @@
+import os
+import re
+
 from PySide6.QtWidgets import QWidget, QMainWindow, QLabel, QLineEdit, QPushButton, QFileDialog, \
     QSpinBox, QTableWidget, QHBoxLayout, QTableWidgetItem, QDialog, QVBoxLayout, QDialogButtonBox, QFrame, QSpacerItem, \
-    QSizePolicy
+    QSizePolicy, QCheckBox, QMessageBox
 
-from veget.ui.scraping_dialog import ScrapingDialog
+from veget.companies import parse_aliases
+from veget.journal import JobJournal
 
 
 class MainWindow(QMainWindow):
@@ -27,7 +31,7 @@ class MainWindow(QMainWindow):
         self.password.setPlaceholderText("LinkedIn password")
         layout.addWidget(self.password)
 
-        sleep_label = QLabel("Sleep", widget)
+        sleep_label = QLabel("Max page wait", widget)
         self.sleep = QSpinBox(widget)
         self.sleep.setMinimum(0)
         self.sleep.setMaximum(60)
@@ -47,6 +51,65 @@ class MainWindow(QMainWindow):
         timeout_layout.addWidget(self.timeout, stretch=1)
         layout.addLayout(timeout_layout)
 
+        sessions_label = QLabel("Sessions", widget)
+        self.sessions = QSpinBox(widget)
+        self.sessions.setMinimum(1)
+        self.sessions.setMaximum(16)
+        self.sessions.setValue(1)
+        sessions_layout = QHBoxLayout(widget)
+        sessions_layout.addWidget(sessions_label)
+        sessions_layout.addWidget(self.sessions, stretch=1)
+        layout.addLayout(sessions_layout)
+
+        concurrency_label = QLabel("Parallel companies", widget)
+        self.concurrency = QSpinBox(widget)
+        self.concurrency.setToolTip("Companies scraped at the same time, each one on its own sessions")
+        self.concurrency.setMinimum(1)
+        self.concurrency.setMaximum(16)
+        self.concurrency.setValue(1)
+        concurrency_layout = QHBoxLayout(widget)
+        concurrency_layout.addWidget(concurrency_label)
+        concurrency_layout.addWidget(self.concurrency, stretch=1)
+        layout.addLayout(concurrency_layout)
+
+        self.use_cache = QCheckBox("Reuse recently scraped profiles", widget)
+        self.use_cache.setChecked(True)
+        layout.addWidget(self.use_cache)
+
+        self.remember_login = QCheckBox("Remember login", widget)
+        self.remember_login.setChecked(True)
+        layout.addWidget(self.remember_login)
+
+        self.lean = QCheckBox("Lean headless browser", widget)
+        self.lean.setToolTip("Run the browser hidden, without loading images, fonts, media or tracking")
+        layout.addWidget(self.lean)
+
+        self.full_experience = QCheckBox("Load every experience", widget)
+        self.full_experience.setToolTip("Open the experience details page of the profiles that do not show all of "
+                                        "their experiences")
+        layout.addWidget(self.full_experience)
+
+        self.headline_only = QCheckBox("Trust search headlines", widget)
+        self.headline_only.setToolTip("Skip visiting the profiles whose search result headline already names the "
+                                      "company, their dates are left unknown")
+        layout.addWidget(self.headline_only)
+
+        self.delta = QCheckBox("Only new or changed profiles", widget)
+        self.delta.setToolTip("Only visit the profiles that are new or whose headline or location changed since the "
+                              "previous scraping, and write the ones no longer found as removed")
+        layout.addWidget(self.delta)
+
+        self.page_source = QCheckBox("Parse page source", widget)
+        self.page_source.setToolTip("Parse each page from a single read of its HTML, looking its elements up one by "
+                                    "one only when that finds nothing")
+        self.page_source.setChecked(True)
+        layout.addWidget(self.page_source)
+
+        self.save_pages = QCheckBox("Save visited profile pages", widget)
+        self.save_pages.setToolTip("Keep the HTML of every visited profile in a '.pages' directory next to the "
+                                   "destination file, to parse it again offline with python -m veget.reparse")
+        layout.addWidget(self.save_pages)
+
         search_frame = QFrame(widget)
         search_frame.setFrameShadow(QFrame.Raised)
         search_frame.setFrameShape(QFrame.StyledPanel)
@@ -54,8 +117,8 @@ class MainWindow(QMainWindow):
         search_frame.setLayout(search_frame_layout)
 
         self.search_table = QTableWidget(self)
-        self.search_table.setColumnCount(2)
-        self.search_table.setHorizontalHeaderLabels(["Company Name", "Search URL"])
+        self.search_table.setColumnCount(3)
+        self.search_table.setHorizontalHeaderLabels(["Company Name", "Search URL", "Aliases"])
         search_frame_layout.addWidget(self.search_table, stretch=1)
 
         table_buttons_layout = QHBoxLayout(widget)
@@ -63,12 +126,15 @@ class MainWindow(QMainWindow):
         self.company_name.setPlaceholderText("Company name")
         self.search_url = QLineEdit(widget)
         self.search_url.setPlaceholderText("Search URL")
+        self.aliases = QLineEdit(widget)
+        self.aliases.setPlaceholderText("Aliases, comma separated")
         self.add_button = QPushButton("+", widget)
         self.add_button.clicked.connect(self._add_table_entry)
         self.clear_button = QPushButton("Clear all", widget)
         self.clear_button.clicked.connect(self._clear_table)
         table_buttons_layout.addWidget(self.company_name, stretch=1)
         table_buttons_layout.addWidget(self.search_url, stretch=2)
+        table_buttons_layout.addWidget(self.aliases, stretch=1)
         table_buttons_layout.addWidget(self.add_button)
         search_frame_layout.addLayout(table_buttons_layout)
         search_frame_layout.addWidget(self.clear_button)
@@ -84,20 +150,52 @@ class MainWindow(QMainWindow):
         layout.addLayout(start_button_layout)
 
     def _start_clicked(self):
+        # The scraping dialog brings in selenium, which is only needed once a scraping starts
+        from veget.ui.scraping_dialog import ScrapingDialog
+
         user = self.username.text()
         password = self.password.text()
         sleep_time = self.sleep.value()
         timeout = self.timeout.value()
+        use_cache = self.use_cache.isChecked()
+        sessions = self.sessions.value()
+        concurrency = self.concurrency.value()
+        remember_login = self.remember_login.isChecked()
+        lean = self.lean.isChecked()
+        full_experience = self.full_experience.isChecked()
+        headline_only = self.headline_only.isChecked()
+        delta = self.delta.isChecked()
+        page_source = self.page_source.isChecked()
         company_search: list[(str, str)] = []
+        aliases: dict[str, tuple[str, ...]] = {}
         for row in range(self.search_table.rowCount()):
-            row_data = []
-            for column in range(self.search_table.columnCount()):
-                item = self.search_table.item(row, column)
-                row_data.append(item.text())
-            company_search.append(tuple(row_data))
-
-        output_filename, _ = QFileDialog.getSaveFileName(self, "Destination CSV", "", "CSV files (*.csv)")
-        scraping_dialog = ScrapingDialog(user, password, sleep_time, timeout, company_search, output_filename, self)
+            company = self.search_table.item(row, 0).text()
+            company_search.append((company, self.search_table.item(row, 1).text()))
+            aliases[company] = parse_aliases(self.search_table.item(row, 2).text())
+
+        output_filename, selected_filter = QFileDialog.getSaveFileName(
+            self, "Destination file", "",
+            "CSV files (*.csv);;JSON lines files (*.jsonl);;Parquet files (*.parquet);;SQLite databases (*.sqlite)")
+        if not output_filename:
+            return
+        # The output format comes from the extension, which not every platform dialog adds
+        if not os.path.splitext(output_filename)[1]:
+            extension = re.search(r"\*(\.\w+)", selected_filter)
+            output_filename += extension.group(1) if extension else ".csv"
+        pages_dir = f"{output_filename}.pages" if self.save_pages.isChecked() else None
+        journal_path = JobJournal.path_for(output_filename)
+        if os.path.exists(journal_path):
+            answer = QMessageBox.question(
+                self, "Unfinished scraping process",
+                "An unfinished scraping process was found for this file. Do you want to resume it?")
+            if answer == QMessageBox.Yes:
+                with JobJournal(journal_path) as journal:
+                    company_search = journal.company_search or company_search
+            else:
+                os.remove(journal_path)
+        scraping_dialog = ScrapingDialog(user, password, sleep_time, timeout, company_search, output_filename,
+                                         use_cache, sessions, remember_login, lean, full_experience, aliases,
+                                         headline_only, concurrency, delta, page_source, pages_dir, self)
         scraping_dialog.exec()
 
     def _add_table_entry(self):
@@ -107,8 +205,10 @@ class MainWindow(QMainWindow):
         self.search_table.insertRow(row_count)
         self.search_table.setItem(row_count, 0, QTableWidgetItem(self.company_name.text()))
         self.search_table.setItem(row_count, 1, QTableWidgetItem(self.search_url.text()))
+        self.search_table.setItem(row_count, 2, QTableWidgetItem(", ".join(parse_aliases(self.aliases.text()))))
         self.company_name.clear()
         self.search_url.clear()
+        self.aliases.clear()
 
     def _clear_table(self):
         self.search_table.clearContents()
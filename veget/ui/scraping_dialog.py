@@ -1,19 +1,36 @@
 # -*- coding: utf-8 -*-
 
-import csv
+import logging
 
-from PySide6.QtCore import QThread, Signal
+from typing import Dict, Iterable, List, Optional
+
+from PySide6.QtCore import QThread, QTimer, Signal
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QWidget
 
-from ..linkedin import LinkedIn, ProfileLink
+from ..journal import JobJournal
+from ..linkedin import LinkedIn, ProfileCache, DEFAULT_BASE_URL
+from ..linkedin.session import SessionStore, DEFAULT_SESSION_PATH
+from ..metrics import Metrics
+from ..progress import ScrapingProgress, ProgressSnapshot
+from ..runner import JobCompany, JobRunner
+from ..snapshots import SnapshotStore, DEFAULT_SNAPSHOT_PATH
 from .console import Console
 
 
 class ScrapingThread(QThread):
+    """
+    Runs a scraping job. It never touches widgets: the progress goes to a shared ScrapingProgress sampled by the GUI
+    thread, and console messages are queued to the GUI thread through the message signal.
+    """
     finished = Signal()
+    message = Signal(str)
 
     def __init__(self, username: str, password: str, sleep_: int, timeout: int, company_search: list[(str, str)],
-                 ofile: str, label: QLabel, console: Console, progress_bar: QProgressBar):
+                 ofile: str, progress: ScrapingProgress, use_cache: bool = True, sessions: int = 1,
+                 remember_login: bool = True, lean: bool = False, full_experience: bool = False,
+                 aliases: Optional[Dict[str, Iterable[str]]] = None, headline_only: bool = False,
+                 concurrency: int = 1, delta: bool = False, page_source: bool = True, pages_dir: Optional[str] = None,
+                 base_url: str = DEFAULT_BASE_URL):
         super().__init__()
         self.username: str = username
         self.password: str = password
@@ -21,66 +38,57 @@ class ScrapingThread(QThread):
         self.timeout: int = timeout
         self.company_search: list[(str, str)] = company_search
         self.ofile: str = ofile
-        self.label = label
-        self.console = console
-        self.progress_bar = progress_bar
+        self.progress = progress
+        self.use_cache: bool = use_cache
+        self.sessions: int = sessions
+        self.remember_login: bool = remember_login
+        self.lean: bool = lean
+        self.full_experience: bool = full_experience
+        self.aliases: Dict[str, Iterable[str]] = aliases or {}
+        self.headline_only: bool = headline_only
+        self.concurrency: int = concurrency
+        self.delta: bool = delta
+        self.page_source: bool = page_source
+        self.pages_dir: Optional[str] = pages_dir
+        self.base_url: str = base_url
+        self.metrics = Metrics()
+        # Exception the job failed with, if any
+        self.error: Optional[Exception] = None
+
+    def _new_session(self) -> LinkedIn:
+        return LinkedIn(self.username, self.password, sleep_time=self.sleep_, timeout=self.timeout, cache=self.cache,
+                        session_store=self.session_store, lean=self.lean, metrics=self.metrics,
+                        base_url=self.base_url, full_experience=self.full_experience,
+                        page_source_extraction=self.page_source, snapshot_dir=self.pages_dir)
 
     def run(self):
-        with LinkedIn(self.username, self.password, sleep_time=self.sleep_, timeout=self.timeout) as li, \
-                open(self.ofile, "w") as f:
-            csv_writer = csv.writer(f)
-            csv_writer.writerow([
-                "Company",
-                "Employee Name",
-                "Role",
-                "Based On",
-                "Start Date",
-                "End Date"
-            ])
-            f.flush()
-
-            for i, (company, search_url) in enumerate(self.company_search):
-                self.label.setText(f"Scraping {company} profiles")
-                profile_links: list[ProfileLink] = li.search(search_url)
-                step = 100 / len(profile_links)
-                self.console.log(f"{company} profiles ({len(profile_links)}) scraped")
-                for profile_link in profile_links:
-                    self.label.setText(f"Working on company {company}. Scraping profile '{profile_link.name}'")
-                    profile = li.get_profile(profile_link)
-                    self.console.log(f"Profile '{profile}')")
-                    if profile.experiences:
-                        for experience in profile.experiences:
-                            if company.lower() == experience.company.lower():
-                                csv_writer.writerow([
-                                    company,
-                                    profile_link.name,
-                                    experience.position,
-                                    experience.location,
-                                    experience.start_date,
-                                    experience.end_date
-                                ])
-                                f.flush()
-                    else:
-                        csv_writer.writerow([
-                            company,
-                            profile_link.name,
-                            profile_link.position,
-                            profile_link.location,
-                            "Unknown",
-                            "Unknown"
-                        ])
-                        f.flush()
-                    self.progress_bar.setValue(self.progress_bar.value() + step)
-                self.progress_bar.setValue((i + 1) * 100)
-
-        self.progress_bar.setValue(self.progress_bar.maximum())
-        self.console.log("Scraping process finished")
+        self.cache = ProfileCache() if self.use_cache else None
+        self.session_store = SessionStore(DEFAULT_SESSION_PATH, self.username, self.password) \
+            if self.remember_login else None
+        companies: List[JobCompany] = [JobCompany(company, search_url, tuple(self.aliases.get(company, ())))
+                                       for company, search_url in self.company_search]
+        # The dialog only learns about a failure through the signals, it would otherwise wait forever
+        try:
+            runner = JobRunner(self._new_session, companies, JobJournal(JobJournal.path_for(self.ofile)), self.ofile,
+                               self.progress, self.metrics, sessions=self.sessions, concurrency=self.concurrency,
+                               headline_only=self.headline_only, on_message=self.message.emit,
+                               snapshots=SnapshotStore(DEFAULT_SNAPSHOT_PATH) if self.delta else None)
+            runner.run()
+        except Exception as e:
+            self.error = e
+            logging.getLogger(__name__).exception("Scraping process failed")
+            self.progress.set_status("Scraping process failed")
+            self.message.emit(f"Scraping process failed: {e}")
+        logging.getLogger(__name__).info(f"Scraping metrics: {self.metrics.summary()}")
         self.finished.emit()
 
 
 class ScrapingDialog(QDialog):
     def __init__(self, username: str, password: str, sleep_: int, timeout: int, company_search: list[(str, str)],
-                 ofile: str, parent: QWidget = None):
+                 ofile: str, use_cache: bool = True, sessions: int = 1, remember_login: bool = True,
+                 lean: bool = False, full_experience: bool = False, aliases: Optional[Dict[str, Iterable[str]]] = None,
+                 headline_only: bool = False, concurrency: int = 1, delta: bool = False, page_source: bool = True,
+                 pages_dir: Optional[str] = None, parent: QWidget = None):
         super().__init__(parent)
         self.setWindowTitle("Scraping LinkedIn Profiles")
         self.username: str = username
@@ -89,6 +97,17 @@ class ScrapingDialog(QDialog):
         self.timeout: int = timeout
         self.company_search: list[(str, str)] = company_search
         self.ofile: str = ofile
+        self.use_cache: bool = use_cache
+        self.sessions: int = sessions
+        self.remember_login: bool = remember_login
+        self.lean: bool = lean
+        self.full_experience: bool = full_experience
+        self.aliases: Optional[Dict[str, Iterable[str]]] = aliases
+        self.headline_only: bool = headline_only
+        self.concurrency: int = concurrency
+        self.delta: bool = delta
+        self.page_source: bool = page_source
+        self.pages_dir: Optional[str] = pages_dir
         self._init_ui()
 
     def _init_ui(self):
@@ -96,15 +115,46 @@ class ScrapingDialog(QDialog):
         layout.setContentsMargins(10, 10, 10, 10)
         self.setLayout(layout)
 
-        action_label = QLabel("Starting scraping process", self)
-        progress_bar = QProgressBar(self)
+        self.action_label = QLabel("Starting scraping process", self)
+        self.progress_bar = QProgressBar(self)
+        self.stats_label = QLabel(self)
         console = Console(self)
-        progress_bar.setMaximum(len(self.company_search) * 100)
-        progress_bar.setMinimum(0)
-        layout.addWidget(action_label)
-        layout.addWidget(progress_bar)
+        self.progress_bar.setMaximum(1000)
+        self.progress_bar.setMinimum(0)
+        layout.addWidget(self.action_label)
+        layout.addWidget(self.progress_bar)
+        layout.addWidget(self.stats_label)
         layout.addWidget(console)
 
+        self.progress = ScrapingProgress(len(self.company_search))
         self.thread = ScrapingThread(self.username, self.password, self.sleep_, self.timeout, self.company_search,
-                                     self.ofile, action_label, console, progress_bar)
+                                     self.ofile, self.progress, self.use_cache, self.sessions, self.remember_login,
+                                     self.lean, self.full_experience, self.aliases, self.headline_only,
+                                     self.concurrency, self.delta, self.page_source, self.pages_dir)
+        self.thread.message.connect(console.log)
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(250)
+        self.progress_timer.timeout.connect(self._update_progress)
+        self.progress_timer.start()
+        self.thread.finished.connect(self._update_progress)
+        self.thread.finished.connect(self.progress_timer.stop)
         self.thread.start()
+
+    def _update_progress(self):
+        snapshot: ProgressSnapshot = self.progress.snapshot()
+        self.action_label.setText(snapshot.status)
+        self.progress_bar.setValue(round(snapshot.fraction * self.progress_bar.maximum()))
+        eta = snapshot.eta
+        stats = [
+            f"{snapshot.profiles} profiles",
+            f"{snapshot.profiles_per_minute:.1f} profiles/min",
+            f"ETA {self._format_duration(eta)}" if eta is not None else "ETA unknown",
+        ]
+        per_company = ", ".join(f"{company}: {count}" for company, count in snapshot.company_profiles.items())
+        self.stats_label.setText(" · ".join(stats) + (f"\n{per_company}" if per_company else ""))
+
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
+        minutes, seconds = divmod(round(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}"